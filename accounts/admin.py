@@ -1,7 +1,11 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from django.contrib import messages
+from django.core.paginator import Paginator
+from django.db import connections
 from django.utils import timezone
+from django.utils.functional import cached_property
+import ipaddress
 import logging
 from .models import (
     User, UserProfile, EmailVerificationLog, ClickTracking, PricingInquiry
@@ -10,6 +14,34 @@ from .models import (
 logger = logging.getLogger('accounts')
 
 
+class FasterAdminPaginator(Paginator):
+    """
+    Paginator for large append-only tables.
+    Unfiltered change-lists use the planner's row estimate from pg_class
+    instead of a full COUNT(*); filtered lists fall back to the exact count.
+    """
+    # Below this the estimate is unreliable (or -1 if never analyzed) and COUNT(*) is cheap
+    ESTIMATE_THRESHOLD = 10000
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if queryset.query.where:
+            return super().count
+
+        with connections[queryset.db].cursor() as cursor:
+            cursor.execute(
+                "SELECT reltuples::bigint FROM pg_class WHERE relname = %s",
+                [queryset.model._meta.db_table],
+            )
+            row = cursor.fetchone()
+
+        estimate = row[0] if row else 0
+        if estimate < self.ESTIMATE_THRESHOLD:
+            return super().count
+        return estimate
+
+
 @admin.register(User)
 class UserAdmin(BaseUserAdmin):
     """Custom admin for User model"""
@@ -20,7 +52,7 @@ class UserAdmin(BaseUserAdmin):
     
     fieldsets = BaseUserAdmin.fieldsets + (
         ('Email Verification', {
-            'fields': ('is_email_verified', 'email_verification_token', 'email_verification_sent_at', 'welcome_email_sent')
+            'fields': ('is_email_verified', 'email_verification_token_hash', 'email_verification_sent_at', 'welcome_email_sent')
         }),
         ('Premium Status', {
             'fields': ('is_premium',)
@@ -47,6 +79,9 @@ class UserProfileAdmin(admin.ModelAdmin):
 class EmailVerificationLogAdmin(admin.ModelAdmin):
     """Admin for EmailVerificationLog model"""
     list_display = ('user', 'sent_at', 'verified_at', 'ip_address')
+    list_select_related = ('user',)
+    paginator = FasterAdminPaginator
+    show_full_result_count = False
     list_filter = ('sent_at', 'verified_at')
     search_fields = ('user__email', 'user__username', 'ip_address')
     readonly_fields = ('user', 'token', 'sent_at', 'verified_at', 'ip_address')
@@ -62,10 +97,14 @@ class EmailVerificationLogAdmin(admin.ModelAdmin):
 class ClickTrackingAdmin(admin.ModelAdmin):
     """Admin for ClickTracking model"""
     list_display = ('page_type', 'user', 'is_authenticated', 'is_premium', 'ip_address', 'created_at')
+    list_select_related = ('user',)
+    paginator = FasterAdminPaginator
+    show_full_result_count = False
     list_filter = ('page_type', 'is_authenticated', 'is_premium', 'created_at')
-    search_fields = ('page_type', 'page_url', 'user__email', 'user__username', 'ip_address', 'organization_name', 'country_code')
-    readonly_fields = ('created_at',)
-    date_hierarchy = 'created_at'
+    search_fields = ('page_type', 'user__email', 'organization_name')
+    readonly_fields = ('created_at', 'user_agent', 'referer')
+    # No date_hierarchy: its drill-down runs DISTINCT date_trunc() over the whole
+    # table. The created_at list_filter already filters with sargable >= / < ranges.
     ordering = ('-created_at',)
     
     fieldsets = (
@@ -83,6 +122,39 @@ class ClickTrackingAdmin(admin.ModelAdmin):
         }),
     )
     
+    # Columns the change-list renders; page_url/user_agent/referer and the context fields stay out
+    changelist_only_fields = (
+        'id', 'page_type', 'user_id', 'user__email', 'user__username',
+        'is_authenticated', 'is_premium', 'ip_address', 'created_at',
+    )
+
+    def get_queryset(self, request):
+        qs = super().get_queryset(request).select_related('user')
+        # The change form shows every field, so only narrow the change-list query
+        match = request.resolver_match
+        if match and match.url_name == f'{self.opts.app_label}_{self.opts.model_name}_changelist':
+            qs = qs.only(*self.changelist_only_fields)
+        return qs
+
+    def get_search_results(self, request, queryset, search_term):
+        """Route terms with a recognisable shape to exact lookups instead of icontains"""
+        term = search_term.strip()
+
+        try:
+            ipaddress.ip_address(term)
+        except ValueError:
+            pass
+        else:
+            return queryset.filter(ip_address=term), False
+
+        if len(term) == 2 and term.isalpha() and term.isupper():
+            return queryset.filter(country_code__iexact=term), False
+
+        if term in ClickTracking.PAGE_KEYS:
+            return queryset.filter(page_type=term), False
+
+        return super().get_search_results(request, queryset, search_term)
+
     def has_add_permission(self, request):
         return False  # Only created through tracking, not manually
 
@@ -0,0 +1,40 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.db.models import Q
+
+User = get_user_model()
+
+
+class EmailOrUsernameBackend(ModelBackend):
+    """
+    Authenticate with either username or email address.
+    Both are matched in a single query; an exact username match wins over an email match.
+    """
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        if username is None:
+            username = kwargs.get(User.USERNAME_FIELD)
+        if username is None or password is None:
+            return None
+
+        candidates = list(
+            User._default_manager.filter(Q(username=username) | Q(email__iexact=username))[:2]
+        )
+        if not candidates:
+            # Run the password hasher once to reduce the timing difference
+            # between an existing and a nonexistent user (same as ModelBackend)
+            User().set_password(password)
+            return None
+
+        user = next((u for u in candidates if u.username == username), candidates[0])
+        if user.check_password(password) and self.user_can_authenticate(user):
+            return user
+        return None
+
+    def get_user(self, user_id):
+        """Load the session user with its profile joined, so views read user.profile without a query"""
+        try:
+            user = User._default_manager.select_related('profile').get(pk=user_id)
+        except User.DoesNotExist:
+            return None
+        return user if self.user_can_authenticate(user) else None
@@ -0,0 +1,27 @@
+import threading
+from contextlib import contextmanager
+
+from django.core.mail import get_connection
+
+# One mail connection per worker thread, reused across email tasks
+_local = threading.local()
+
+
+@contextmanager
+def smtp_connection():
+    """
+    Yield this thread's mail connection, opening it on first use.
+    Keeps the SMTP session (TLS handshake + AUTH) alive across tasks; any error
+    closes it so the next send reconnects instead of reusing a dead socket.
+    """
+    connection = getattr(_local, 'connection', None)
+    if connection is None:
+        connection = get_connection()
+        connection.open()
+        _local.connection = connection
+    try:
+        yield connection
+    except Exception:
+        _local.connection = None
+        connection.close()
+        raise
@@ -2,6 +2,7 @@ from django import forms
 from django.contrib.auth.forms import UserCreationForm, AuthenticationForm
 from django.contrib.auth import get_user_model
 from django.core.exceptions import ValidationError
+from django.db.models import Q
 from .models import UserProfile, PricingInquiry
 
 User = get_user_model()
@@ -49,14 +50,11 @@ class SignUpForm(UserCreationForm):
         fields = ('email', 'username', 'password1', 'password2', 'agree_terms')
     
     def clean_email(self):
-        """Ensure email is unique and lowercase"""
-        email = self.cleaned_data.get('email', '').lower().strip()
-        if User.objects.filter(email=email).exists():
-            raise ValidationError('This email address is already registered.')
-        return email
+        """Normalize email to lowercase (uniqueness is checked in clean())"""
+        return self.cleaned_data.get('email', '').lower().strip()
     
     def clean_username(self):
-        """Strip whitespace and let Django's UserCreationForm handle uniqueness"""
+        """Strip whitespace (uniqueness is checked in clean())"""
         # Get and strip username
         username = self.cleaned_data.get('username', '')
         if isinstance(username, str):
@@ -65,11 +63,27 @@ class SignUpForm(UserCreationForm):
         if not username:
             raise ValidationError('Username is required.')
         
-        # Check uniqueness explicitly (Django's parent method does this too, but be explicit)
-        if User.objects.filter(username=username).exists():
-            raise ValidationError('This username is already taken.')
-        
         return username
+    
+    def clean(self):
+        """Check email and username uniqueness with a single query"""
+        cleaned_data = super().clean()
+        email = cleaned_data.get('email')
+        username = cleaned_data.get('username')
+        
+        lookup = Q()
+        if email:
+            lookup |= Q(email__iexact=email)
+        if username:
+            lookup |= Q(username=username)
+        if lookup:
+            for existing_email, existing_username in User.objects.filter(lookup).values_list('email', 'username'):
+                if email and existing_email.lower() == email and not self.has_error('email'):
+                    self.add_error('email', 'This email address is already registered.')
+                if username and existing_username == username and not self.has_error('username'):
+                    self.add_error('username', 'This username is already taken.')
+        
+        return cleaned_data
 
 
 class LoginForm(AuthenticationForm):
@@ -45,10 +45,11 @@ class Command(BaseCommand):
             raise CommandError('Provide either --username or --email, not both')
 
         try:
-            if username:
-                user = User.objects.get(username=username)
-            else:
-                user = User.objects.get(email=email.lower())
+            lookup = {'username': username} if username else {'email': email.lower()}
+            # Only load the columns shown below
+            user = User.objects.only(
+                'id', 'username', 'email', 'is_superuser', 'is_staff', 'is_active', 'date_joined'
+            ).get(**lookup)
 
             # Show user info
             self.stdout.write(f'\nUser found:')
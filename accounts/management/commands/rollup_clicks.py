@@ -0,0 +1,25 @@
+"""
+Management command to rebuild the daily ClickTracking rollup used by the analytics dashboard.
+Runs nightly via Celery beat (accounts.tasks.rollup_clicks_task); use --days to backfill.
+"""
+from django.core.management.base import BaseCommand
+from accounts.models import ClickTrackingDailyRollup
+
+
+class Command(BaseCommand):
+    help = 'Rebuild daily click tracking rollups for the last N complete days'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=ClickTrackingDailyRollup.REBUILD_DAYS,
+            help=f'Number of complete days to rebuild (default: {ClickTrackingDailyRollup.REBUILD_DAYS})',
+        )
+
+    def handle(self, *args, **options):
+        days = options['days']
+        written = ClickTrackingDailyRollup.rebuild(days=days)
+        self.stdout.write(
+            self.style.SUCCESS(f'Rebuilt {written} rollup row(s) for the last {days} day(s).')
+        )
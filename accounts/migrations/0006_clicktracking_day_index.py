@@ -0,0 +1,18 @@
+# Generated by Django 6.0.2 on 2026-10-15 00:50
+
+import django.db.models.functions.datetime
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0005_trigram_search_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='clicktracking',
+            index=models.Index(django.db.models.functions.datetime.TruncDate('created_at'), name='clicktracking_day_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 6.0.2 on 2026-10-15 00:51
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0006_clicktracking_day_index'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='clicktracking',
+            name='accounts_cl_created_013f80_idx',
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 6.0.2 on 2026-10-15 00:52
+
+import django.contrib.postgres.indexes
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0007_remove_duplicate_created_at_index'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='emailverificationlog',
+            name='accounts_em_sent_at_cd3fd7_idx',
+        ),
+        migrations.AddIndex(
+            model_name='emailverificationlog',
+            index=django.contrib.postgres.indexes.BrinIndex(fields=['sent_at'], name='evl_sent_at_brin'),
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 6.0.2 on 2026-10-15 01:10
+
+import hashlib
+
+from django.db import migrations, models
+
+
+def hash_existing_tokens(apps, schema_editor):
+    """Hash outstanding tokens so verification links already sent keep working"""
+    User = apps.get_model('accounts', 'User')
+    EmailVerificationLog = apps.get_model('accounts', 'EmailVerificationLog')
+
+    users = User.objects.exclude(email_verification_token__isnull=True).exclude(email_verification_token='')
+    for user in users.only('pk', 'email_verification_token').iterator():
+        user.email_verification_token_hash = hashlib.sha256(user.email_verification_token.encode()).hexdigest()
+        user.save(update_fields=['email_verification_token_hash'])
+
+    for log in EmailVerificationLog.objects.only('pk', 'token').iterator():
+        log.token = hashlib.sha256(log.token.encode()).hexdigest()
+        log.save(update_fields=['token'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0008_verification_log_sent_at_brin'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='email_verification_token_hash',
+            field=models.CharField(blank=True, db_index=True, max_length=64, null=True),
+        ),
+        migrations.AlterField(
+            model_name='emailverificationlog',
+            name='token',
+            field=models.CharField(help_text='SHA-256 hash of the verification token', max_length=100),
+        ),
+        migrations.RunPython(hash_existing_tokens, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='user',
+            name='email_verification_token',
+        ),
+    ]
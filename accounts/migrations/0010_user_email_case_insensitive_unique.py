@@ -0,0 +1,50 @@
+# Generated by Django 6.0.2 on 2026-10-15 01:25
+
+import django.db.models.functions.text
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import Upper
+
+
+def check_case_duplicates(apps, schema_editor):
+    """
+    Abort with the clashing addresses instead of a bare index error: accounts whose emails
+    differ only in case have to be merged or renamed by hand before the constraint can exist.
+    """
+    User = apps.get_model('accounts', 'User')
+    duplicated = (
+        User.objects.values(email_upper=Upper('email'))
+        .annotate(n=Count('pk'))
+        .filter(n__gt=1)
+        .values('email_upper')
+    )
+    users = (
+        User.objects.annotate(email_upper=Upper('email'))
+        .filter(email_upper__in=duplicated)
+        .order_by('email_upper', 'pk')
+        .values_list('email_upper', 'pk', 'email')
+    )
+    clashes = {}
+    for email_upper, pk, email in users:
+        clashes.setdefault(email_upper, []).append(f"{email} (id={pk})")
+    if clashes:
+        raise RuntimeError(
+            "Cannot add user_email_ci_uniq: these users' emails differ only in case. "
+            "Merge or rename them, then migrate again:\n  " + '\n  '.join(map(', '.join, clashes.values()))
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0009_hash_verification_tokens'),
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        migrations.RunPython(check_case_duplicates, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='user',
+            constraint=models.UniqueConstraint(django.db.models.functions.text.Upper('email'), name='user_email_ci_uniq', violation_error_message='This email address is already registered.'),
+        ),
+    ]
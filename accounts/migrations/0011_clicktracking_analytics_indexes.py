@@ -0,0 +1,29 @@
+# Generated by Django 6.0.2 on 2026-10-15 02:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0010_user_email_case_insensitive_unique'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='clicktracking',
+            index=models.Index(fields=['created_at', 'page_type'], name='ct_created_page_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='clicktracking',
+            index=models.Index(condition=models.Q(('country_code', ''), _negated=True), fields=['created_at', 'country_code'], name='ct_created_country_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='clicktracking',
+            index=models.Index(condition=models.Q(('region', ''), _negated=True), fields=['created_at', 'region'], name='ct_created_region_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='clicktracking',
+            index=models.Index(condition=models.Q(('referer', ''), _negated=True), fields=['created_at', 'referer'], name='ct_created_referer_idx'),
+        ),
+    ]
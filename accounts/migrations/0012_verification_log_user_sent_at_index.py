@@ -0,0 +1,17 @@
+# Generated by Django 6.0.2 on 2026-10-15 02:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0011_clicktracking_analytics_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='emailverificationlog',
+            index=models.Index(fields=['user', 'sent_at'], name='evl_user_sent_at_idx'),
+        ),
+    ]
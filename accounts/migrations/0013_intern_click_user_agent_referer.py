@@ -0,0 +1,91 @@
+# Generated by Django 6.0.2 on 2026-10-15 03:10
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+# Set-based backfill: the click table is too large to walk row by row in Python
+INTERN_SQL = """
+INSERT INTO accounts_{table} (text)
+SELECT DISTINCT {column} FROM accounts_clicktracking WHERE {column} <> ''
+ON CONFLICT (text) DO NOTHING;
+
+UPDATE accounts_clicktracking AS c
+SET {column}_ref_id = t.id
+FROM accounts_{table} AS t
+WHERE t.text = c.{column};
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0012_verification_log_user_sent_at_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Referer',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('text', models.CharField(max_length=500, unique=True)),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='UserAgent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('text', models.CharField(max_length=500, unique=True)),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.RemoveIndex(
+            model_name='clicktracking',
+            name='ct_created_referer_idx',
+        ),
+        migrations.AddField(
+            model_name='clicktracking',
+            name='referer_ref',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='accounts.referer'),
+        ),
+        migrations.AddField(
+            model_name='clicktracking',
+            name='user_agent_ref',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='accounts.useragent'),
+        ),
+        migrations.RunSQL(
+            INTERN_SQL.format(table='referer', column='referer'),
+            migrations.RunSQL.noop,
+        ),
+        migrations.RunSQL(
+            INTERN_SQL.format(table='useragent', column='user_agent'),
+            migrations.RunSQL.noop,
+        ),
+        migrations.RemoveField(
+            model_name='clicktracking',
+            name='referer',
+        ),
+        migrations.RemoveField(
+            model_name='clicktracking',
+            name='user_agent',
+        ),
+        migrations.RenameField(
+            model_name='clicktracking',
+            old_name='referer_ref',
+            new_name='referer',
+        ),
+        migrations.RenameField(
+            model_name='clicktracking',
+            old_name='user_agent_ref',
+            new_name='user_agent',
+        ),
+        migrations.AddIndex(
+            model_name='clicktracking',
+            index=models.Index(condition=models.Q(('referer__isnull', False)), fields=['created_at', 'referer'], name='ct_created_referer_idx'),
+        ),
+    ]
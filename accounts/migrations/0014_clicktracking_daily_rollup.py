@@ -0,0 +1,30 @@
+# Generated by Django 6.0.2 on 2026-10-15 03:45
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0013_intern_click_user_agent_referer'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ClickTrackingDailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('page_type', models.CharField(max_length=50)),
+                ('country_code', models.CharField(blank=True, max_length=10)),
+                ('region', models.CharField(blank=True, max_length=10)),
+                ('count', models.PositiveIntegerField()),
+                ('referer', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='accounts.referer')),
+            ],
+            options={
+                'verbose_name': 'Click Tracking Daily Rollup',
+                'indexes': [models.Index(fields=['day'], name='ct_rollup_day_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 6.0.2 on 2026-10-15 07:30
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0014_clicktracking_daily_rollup'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='clicktracking',
+            name='created_at',
+            field=models.DateTimeField(db_index=True, default=django.utils.timezone.now, editable=False),
+        ),
+    ]
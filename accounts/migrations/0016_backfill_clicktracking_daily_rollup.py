@@ -0,0 +1,45 @@
+# Generated by Django 6.0.2 on 2026-10-15 07:35
+
+from datetime import datetime, time
+
+from django.db import migrations
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+
+def backfill_rollup(apps, schema_editor):
+    """Roll up every complete day already in ClickTracking (same grouping as ClickTrackingDailyRollup.rebuild)"""
+    ClickTracking = apps.get_model('accounts', 'ClickTracking')
+    ClickTrackingDailyRollup = apps.get_model('accounts', 'ClickTrackingDailyRollup')
+
+    today = timezone.localdate()
+    rows = ClickTracking.objects.filter(
+        created_at__lt=timezone.make_aware(datetime.combine(today, time.min)),
+    ).annotate(
+        day=TruncDate('created_at')
+    ).values(
+        'day', 'page_type', 'country_code', 'region', 'referer_id'
+    ).annotate(
+        count=Count('id')
+    ).order_by()
+
+    ClickTrackingDailyRollup.objects.filter(day__lt=today).delete()
+    ClickTrackingDailyRollup.objects.bulk_create(
+        (ClickTrackingDailyRollup(**row) for row in rows.iterator()), batch_size=1000
+    )
+
+
+def clear_rollup(apps, schema_editor):
+    apps.get_model('accounts', 'ClickTrackingDailyRollup').objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0015_clicktracking_created_at_default'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_rollup, clear_rollup),
+    ]
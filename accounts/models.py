@@ -1,17 +1,48 @@
-from django.db import models
+from django.conf import settings
+from django.db import DatabaseError, models, transaction
+from django.db.models import Case, Count, F, Q, When
+from django.db.models.functions import TruncDate, Upper
 from django.contrib.auth.models import AbstractUser
+from django.contrib.postgres.indexes import BrinIndex, GinIndex, OpClass
+from django.core.cache import cache
 from django.utils.translation import gettext_lazy as _
 from django.urls import reverse
 from django.utils import timezone
-from datetime import timedelta
+from django.utils.functional import cached_property
+from datetime import date, datetime, time, timedelta
+import functools
+import hashlib
+import ipaddress
+import json
+import logging
 import secrets
 
+logger = logging.getLogger('accounts')
+
+# Redis list of clicks queued by ClickTracking.record(), written in batches by flush_clicks_task
+CLICK_QUEUE_KEY = 'clicktracking:queue'
+# text -> id per InternedText model, filled by InternedText.ids_for()
+_interned_ids = {}
+
+
+@functools.lru_cache(maxsize=1)
+def _click_queue():
+    """Redis client for the click queue; the Celery broker's Redis holds it"""
+    import redis
+
+    return redis.Redis.from_url(settings.CELERY_BROKER_URL)
+
+
+def hash_verification_token(token):
+    """Verification tokens are stored as SHA-256 hex digests, never in the clear"""
+    return hashlib.sha256(token.encode()).hexdigest()
+
 
 class User(AbstractUser):
     """Custom User model with email verification"""
     email = models.EmailField(_('email address'), unique=True)
     is_email_verified = models.BooleanField(default=False)
-    email_verification_token = models.CharField(max_length=100, blank=True, null=True)
+    email_verification_token_hash = models.CharField(max_length=64, blank=True, null=True, db_index=True)
     email_verification_sent_at = models.DateTimeField(null=True, blank=True)
     welcome_email_sent = models.BooleanField(default=False)
     
@@ -29,27 +60,69 @@ class User(AbstractUser):
     
     USERNAME_FIELD = 'username'
     REQUIRED_FIELDS = ['email']
+
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            # Trigram index for admin `user__email` search (icontains -> UPPER(email) LIKE)
+            GinIndex(OpClass(Upper('email'), name='gin_trgm_ops'), name='user_email_trgm'),
+        ]
+        constraints = [
+            # Case-insensitive uniqueness; also serves `email__iexact` lookups (UPPER(email) = UPPER(%s))
+            models.UniqueConstraint(
+                Upper('email'),
+                name='user_email_ci_uniq',
+                violation_error_message='This email address is already registered.',
+            ),
+        ]
     
     def __str__(self):
         return self.username
+
+    @cached_property
+    def is_premium_effective(self):
+        """Premium features apply to paying users and superusers alike"""
+        return self.is_premium or self.is_superuser
     
     def generate_verification_token(self):
-        """Generate a secure verification token"""
-        self.email_verification_token = secrets.token_urlsafe(32)
+        """
+        Generate a secure verification token.
+        Only its hash is kept on the user; the raw token is returned for the email link.
+        """
+        token = secrets.token_urlsafe(32)
+        self.email_verification_token_hash = hash_verification_token(token)
         self.email_verification_sent_at = timezone.now()
-        return self.email_verification_token
+        return token
     
     def verify_email(self):
         """Mark email as verified and activate account"""
         self.is_email_verified = True
         self.is_active = True
-        self.email_verification_token = None
-        self.save(update_fields=['is_email_verified', 'is_active', 'email_verification_token'])
+        self.email_verification_token_hash = None
+        self.save(update_fields=['is_email_verified', 'is_active', 'email_verification_token_hash'])
+
+    @classmethod
+    def bump_search(cls, user_id, limit=None):
+        """
+        Count one search for the user in a single UPDATE, resetting the counter on a new day.
+        With `limit`, the row is only updated while the user is under it.
+        Returns True if the search was counted.
+        """
+        today = date.today()
+        is_new_day = Q(searches_reset_date__lt=today) | Q(searches_reset_date__isnull=True)
+        qs = cls.objects.filter(pk=user_id)
+        if limit is not None:
+            qs = qs.filter(is_new_day | Q(searches_today__lt=limit))
+        return qs.update(
+            searches_today=Case(When(is_new_day, then=1), default=F('searches_today') + 1),
+            searches_reset_date=today,
+        ) > 0
     
     def export_data(self):
         """
         Export all user data in JSON format for GDPR compliance (Right to Data Portability).
         Returns a dictionary with all user-related data.
+        Load the user with select_related('profile') and prefetch_related('verification_logs')
+        to avoid extra queries.
         """
         data = {
             'user': {
@@ -68,8 +141,8 @@ class User(AbstractUser):
         }
         
         # Add profile data if exists
-        if hasattr(self, 'profile'):
-            profile = self.profile
+        profile = getattr(self, 'profile', None)
+        if profile is not None:
             data['profile'] = {
                 'first_name': profile.first_name,
                 'last_name': profile.last_name,
@@ -80,20 +153,21 @@ class User(AbstractUser):
             }
         
         # Add verification logs (anonymize IP addresses for privacy)
-        if hasattr(self, 'verification_logs'):
-            for log in self.verification_logs.all():
-                # Anonymize IP: only keep first 2 octets (e.g., 192.168.x.x)
-                ip = log.ip_address
-                if ip:
-                    parts = str(ip).split('.')
-                    if len(parts) == 4:
-                        ip = f"{parts[0]}.{parts[1]}.x.x"
-                
-                data['verification_logs'].append({
-                    'sent_at': log.sent_at.isoformat() if log.sent_at else None,
-                    'verified_at': log.verified_at.isoformat() if log.verified_at else None,
-                    'ip_address_anonymized': ip,
-                })
+        for log in self.verification_logs.all():
+            # Anonymize IP: keep first 2 octets for IPv4 (e.g., 192.168.x.x), /48 prefix for IPv6
+            ip = log.ip_address
+            if ip:
+                addr = ipaddress.ip_address(ip)
+                if addr.version == 4:
+                    ip = '.'.join(str(addr).split('.')[:2]) + '.x.x'
+                else:
+                    ip = str(ipaddress.ip_network(f'{addr}/48', strict=False))
+            
+            data['verification_logs'].append({
+                'sent_at': log.sent_at.isoformat() if log.sent_at else None,
+                'verified_at': log.verified_at.isoformat() if log.verified_at else None,
+                'ip_address_anonymized': ip,
+            })
         
         return data
     
@@ -137,7 +211,7 @@ class UserProfile(models.Model):
 class EmailVerificationLog(models.Model):
     """Track email verification attempts"""
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='verification_logs')
-    token = models.CharField(max_length=100)
+    token = models.CharField(max_length=100, help_text="SHA-256 hash of the verification token")
     sent_at = models.DateTimeField(auto_now_add=True)
     verified_at = models.DateTimeField(null=True, blank=True)
     ip_address = models.GenericIPAddressField(null=True, blank=True)
@@ -145,21 +219,35 @@ class EmailVerificationLog(models.Model):
     class Meta:
         ordering = ['-sent_at']
         indexes = [
-            models.Index(fields=['sent_at']),  # For data retention queries
+            # For data retention queries: BRIN suits the append-only sent_at range scans
+            BrinIndex(fields=['sent_at'], name='evl_sent_at_brin'),
+            # Per-user recent-sends check in resend_verification
+            models.Index(fields=['user', 'sent_at'], name='evl_user_sent_at_idx'),
         ]
     
     def __str__(self):
         return f"{self.user.email} - {self.sent_at}"
     
+    CLEANUP_BATCH_SIZE = 5000
+
     @classmethod
     def cleanup_old_logs(cls, days=365):
         """
         Delete verification logs older than specified days.
         GDPR compliance: Implement data retention policy.
+        Deletes in batches so each statement stays short and memory stays bounded.
         """
         from datetime import timedelta
         cutoff_date = timezone.now() - timedelta(days=days)
-        deleted_count, _ = cls.objects.filter(sent_at__lt=cutoff_date).delete()
+        old_logs = cls.objects.filter(sent_at__lt=cutoff_date).order_by()
+
+        deleted_count = 0
+        while True:
+            ids = list(old_logs.values_list('pk', flat=True)[:cls.CLEANUP_BATCH_SIZE])
+            if not ids:
+                break
+            deleted, _ = cls.objects.filter(pk__in=ids).delete()
+            deleted_count += deleted
         return deleted_count
 
 
@@ -194,6 +282,44 @@ class PricingInquiry(models.Model):
         return f"{self.full_name} — {self.get_plan_display()} — {self.created_at:%Y-%m-%d}"
 
 
+class InternedText(models.Model):
+    """Distinct string stored once and referenced by id from ClickTracking"""
+    text = models.CharField(max_length=500, unique=True)
+
+    INTERN_CACHE_SIZE = 2048  # ids kept in process per model
+
+    class Meta:
+        abstract = True
+
+    def __str__(self):
+        return self.text
+
+    @classmethod
+    def ids_for(cls, texts):
+        """
+        Map each non-empty text to its row id.
+        Unseen texts are inserted in one bulk INSERT and read back in one SELECT.
+        """
+        known = _interned_ids.setdefault(cls, {})
+        texts = {text for text in texts if text}
+        missing = texts - known.keys()
+        if missing:
+            if len(known) + len(missing) > cls.INTERN_CACHE_SIZE:
+                known.clear()
+                missing = texts
+            cls.objects.bulk_create([cls(text=text) for text in missing], ignore_conflicts=True)
+            known.update(cls.objects.filter(text__in=missing).values_list('text', 'pk'))
+        return {text: known[text] for text in texts}
+
+
+class UserAgent(InternedText):
+    """User-Agent header seen on tracked clicks"""
+
+
+class Referer(InternedText):
+    """Referer header seen on tracked clicks"""
+
+
 class ClickTracking(models.Model):
     """Track page views and clicks for analytics"""
     PAGE_CHOICES = [
@@ -208,6 +334,7 @@ class ClickTracking(models.Model):
         ('gatekeeper_pdf', 'Gatekeeper PDF Download'),
         ('regional_pdf', 'Regional PDF Download'),
     ]
+    PAGE_KEYS = frozenset(key for key, _ in PAGE_CHOICES)
     
     # Page identification
     page_type = models.CharField(max_length=50, choices=PAGE_CHOICES, db_index=True)
@@ -227,8 +354,9 @@ class ClickTracking(models.Model):
     
     # Request information
     ip_address = models.GenericIPAddressField(null=True, blank=True)
-    user_agent = models.CharField(max_length=500, blank=True)
-    referer = models.CharField(max_length=500, blank=True)
+    # Interned: most clicks share a handful of browsers and referers
+    user_agent = models.ForeignKey(UserAgent, on_delete=models.PROTECT, null=True, blank=True, related_name='+')
+    referer = models.ForeignKey(Referer, on_delete=models.PROTECT, null=True, blank=True, related_name='+')
     
     # Additional context
     country_code = models.CharField(max_length=10, blank=True, help_text="For country-specific pages")
@@ -236,14 +364,33 @@ class ClickTracking(models.Model):
     region = models.CharField(max_length=10, blank=True, help_text="For regional pages")
     
     # Timestamp
-    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    # Set when the click is queued, not when the batch reaches the table
+    created_at = models.DateTimeField(default=timezone.now, editable=False, db_index=True)
     
     class Meta:
         ordering = ['-created_at']
         indexes = [
             models.Index(fields=['page_type', '-created_at']),
             models.Index(fields=['is_authenticated', 'is_premium', '-created_at']),
-            models.Index(fields=['created_at']),
+            # Matches TruncDate('created_at') so the daily breakdown can group off the index
+            models.Index(TruncDate('created_at'), name='clicktracking_day_idx'),
+            # Trigram index for admin search (icontains -> UPPER(organization_name) LIKE)
+            GinIndex(OpClass(Upper('organization_name'), name='gin_trgm_ops'), name='clicktracking_org_trgm'),
+            # Analytics window scans (created_at >= cutoff) grouped by a low-cardinality column.
+            # Most rows have no country/region/referer, so those indexes are partial.
+            models.Index(fields=['created_at', 'page_type'], name='ct_created_page_idx'),
+            models.Index(
+                fields=['created_at', 'country_code'], name='ct_created_country_idx',
+                condition=~Q(country_code=''),
+            ),
+            models.Index(
+                fields=['created_at', 'region'], name='ct_created_region_idx',
+                condition=~Q(region=''),
+            ),
+            models.Index(
+                fields=['created_at', 'referer'], name='ct_created_referer_idx',
+                condition=Q(referer__isnull=False),
+            ),
         ]
         verbose_name = "Click Tracking"
         verbose_name_plural = "Click Tracking"
@@ -252,49 +399,219 @@ class ClickTracking(models.Model):
         user_str = self.user.email if self.user else "Anonymous"
         return f"{self.page_type} - {user_str} - {self.created_at}"
     
+    FLUSH_INTERVAL = 5  # seconds between flush_clicks_task runs (Celery beat)
+    FLUSH_BATCH_SIZE = 500  # queued clicks per multi-row INSERT
+    QUEUED_FIELDS = (
+        'page_type', 'page_url', 'user_id', 'is_authenticated', 'is_premium', 'ip_address',
+        'country_code', 'organization_name', 'region',
+    )
+
+    @classmethod
+    def record(cls, **fields):
+        """
+        Queue a click for a batched insert instead of writing it on the request path.
+        The click goes onto a Redis list (the Celery broker's) once the request's transaction
+        commits, so it survives the web worker; flush_queue() writes it from a Celery task.
+        `user_agent` and `referer` are plain strings; they are interned at flush time.
+        """
+        # bulk_create skips field validation, so check page_type against the precomputed set
+        if fields.get('page_type') not in cls.PAGE_KEYS:
+            raise ValueError(f"Unknown page_type: {fields.get('page_type')!r}")
+        payload = {name: fields.get(name) for name in cls.QUEUED_FIELDS}
+        payload['user_agent'] = fields.get('user_agent', '')
+        payload['referer'] = fields.get('referer', '')
+        payload['created_at'] = timezone.now().isoformat()
+        message = json.dumps(payload)
+        # robust: a Redis outage is logged instead of failing the request at commit
+        transaction.on_commit(lambda: _click_queue().rpush(CLICK_QUEUE_KEY, message), robust=True)
+
+    @classmethod
+    def flush_queue(cls):
+        """
+        Write queued clicks with multi-row INSERTs. Returns the number written.
+        A batch is only trimmed from the queue after it is written, so a worker killed
+        mid-flush leaves it for the next run (at worst rows are written twice, never lost).
+        """
+        queue = _click_queue()
+        lock = queue.lock(f'{CLICK_QUEUE_KEY}:flush', timeout=300)
+        if not lock.acquire(blocking=False):
+            return 0  # another flush is draining the queue
+        written = 0
+        try:
+            while raw := queue.lrange(CLICK_QUEUE_KEY, 0, cls.FLUSH_BATCH_SIZE - 1):
+                written += cls._write_batch([json.loads(message) for message in raw])
+                queue.ltrim(CLICK_QUEUE_KEY, len(raw), -1)
+        finally:
+            lock.release()
+        if written:
+            # bulk_create doesn't send post_save, so invalidate cached stats here
+            cls.bump_stats_version()
+        return written
+
+    @classmethod
+    def _write_batch(cls, payloads):
+        """Insert one batch of queued clicks; a batch that fails is retried row by row."""
+        user_agent_ids = UserAgent.ids_for(p['user_agent'] for p in payloads)
+        referer_ids = Referer.ids_for(p['referer'] for p in payloads)
+        # Users deleted since the click was queued get NULL, as on_delete=SET_NULL would give them
+        user_ids = {p['user_id'] for p in payloads if p['user_id']}
+        live_user_ids = set(User.objects.filter(pk__in=user_ids).values_list('pk', flat=True)) if user_ids else set()
+        clicks = [
+            cls(
+                **{name: p[name] for name in cls.QUEUED_FIELDS},
+                user_agent_id=user_agent_ids.get(p['user_agent']),
+                referer_id=referer_ids.get(p['referer']),
+                created_at=datetime.fromisoformat(p['created_at']),
+            )
+            for p in payloads
+        ]
+        for click in clicks:
+            if click.user_id not in live_user_ids:
+                click.user_id = None
+
+        try:
+            with transaction.atomic():
+                cls.objects.bulk_create(clicks)
+            return len(clicks)
+        except DatabaseError as e:
+            logger.warning(f"Click batch of {len(clicks)} failed ({e}); retrying row by row")
+
+        written = 0
+        for click in clicks:
+            click.pk = None  # may hold an id from the rolled-back bulk INSERT
+            try:
+                with transaction.atomic():
+                    click.save(force_insert=True)
+                written += 1
+            except DatabaseError as e:
+                logger.error(f"Dropping click {click.page_type} {click.page_url}: {e}")
+        return written
+
+    @staticmethod
+    def window_start(days):
+        """
+        Start of the dashboard's N-day window: local midnight N-1 days ago, so today is
+        day one. Whole days, so raw counts and ClickTrackingDailyRollup sums cover the same span.
+        """
+        first_day = timezone.localdate() - timedelta(days=days - 1)
+        return timezone.make_aware(datetime.combine(first_day, time.min))
+
+    STATS_CACHE_TIMEOUT = 300  # seconds
+    STATS_VERSION_KEY = 'clicktracking:stats:version'
+
     @classmethod
     def get_stats(cls, days=30):
         """
         Get aggregated statistics for the last N days.
         Returns dict with various metrics.
+        Cached per `days` under a version key that is bumped whenever clicks are recorded.
         """
-        from datetime import timedelta
-        from django.db.models import Count, Q
-        
-        cutoff_date = timezone.now() - timedelta(days=days)
-        recent_clicks = cls.objects.filter(created_at__gte=cutoff_date)
-        
-        total_clicks = recent_clicks.count()
-        authenticated_clicks = recent_clicks.filter(is_authenticated=True).count()
-        anonymous_clicks = recent_clicks.filter(is_authenticated=False).count()
-        premium_clicks = recent_clicks.filter(is_premium=True).count()
-        
+        version = cache.get(cls.STATS_VERSION_KEY, 0)
+        key = f'clicktracking:stats:v{version}:{days}'
+        stats = cache.get(key)
+        if stats is None:
+            stats = cls._compute_stats(days)
+            cache.set(key, stats, cls.STATS_CACHE_TIMEOUT)
+        return stats
+
+    @classmethod
+    def bump_stats_version(cls):
+        """Invalidate cached get_stats() results"""
+        try:
+            cache.incr(cls.STATS_VERSION_KEY)
+        except ValueError:
+            cache.set(cls.STATS_VERSION_KEY, 1, None)
+
+    @classmethod
+    def _compute_stats(cls, days):
+        recent_clicks = cls.objects.filter(created_at__gte=cls.window_start(days))
+
+        # Scalar totals in one pass over the window
+        totals = recent_clicks.aggregate(
+            total=Count('id'),
+            authenticated=Count('id', filter=Q(is_authenticated=True)),
+            anonymous=Count('id', filter=Q(is_authenticated=False)),
+            premium=Count('id', filter=Q(is_premium=True)),
+        )
+
         # Page type breakdown
         page_stats = recent_clicks.values('page_type').annotate(
             count=Count('id')
         ).order_by('-count')
-        
+
         # Daily breakdown
-        daily_stats = recent_clicks.extra(
-            select={'day': 'DATE(created_at)'}
+        daily_stats = recent_clicks.annotate(
+            day=TruncDate('created_at')
         ).values('day').annotate(
             count=Count('id')
         ).order_by('day')
-        
+
         # User breakdown (top users)
         user_stats = recent_clicks.filter(user__isnull=False).values(
             'user__email', 'user__is_premium'
         ).annotate(
             count=Count('id')
         ).order_by('-count')[:20]
-        
+
         return {
-            'total_clicks': total_clicks,
-            'authenticated_clicks': authenticated_clicks,
-            'anonymous_clicks': anonymous_clicks,
-            'premium_clicks': premium_clicks,
-            'page_stats': list(page_stats),
-            'daily_stats': list(daily_stats),
-            'top_users': list(user_stats),
+            'total_clicks': totals['total'],
+            'authenticated_clicks': totals['authenticated'],
+            'anonymous_clicks': totals['anonymous'],
+            'premium_clicks': totals['premium'],
+            # Cached and mutated by the dashboard, so these stay lists; iterator()
+            # builds each one straight from the cursor instead of copying _result_cache
+            'page_stats': list(page_stats.iterator()),
+            'daily_stats': list(daily_stats.iterator()),
+            'top_users': list(user_stats.iterator()),
             'period_days': days,
-        }
\ No newline at end of file
+        }
+
+
+class ClickTrackingDailyRollup(models.Model):
+    """
+    Per-day click counts grouped by the dashboard's breakdown columns.
+    Rebuilt nightly for complete days so multi-day dashboards don't rescan raw clicks.
+    Each rebuild redoes the last REBUILD_DAYS days, so a missed night is filled by the next run.
+    """
+    REBUILD_DAYS = 30  # the dashboard's default window
+
+    day = models.DateField()
+    page_type = models.CharField(max_length=50)
+    country_code = models.CharField(max_length=10, blank=True)
+    region = models.CharField(max_length=10, blank=True)
+    referer = models.ForeignKey(Referer, on_delete=models.PROTECT, null=True, blank=True, related_name='+')
+    count = models.PositiveIntegerField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['day'], name='ct_rollup_day_idx'),
+        ]
+        verbose_name = "Click Tracking Daily Rollup"
+
+    def __str__(self):
+        return f"{self.day} - {self.page_type} - {self.count}"
+
+    @classmethod
+    def rebuild(cls, days=REBUILD_DAYS):
+        """
+        Recompute rollup rows for the last N complete days (today is excluded).
+        Idempotent: the days are deleted and rewritten in one transaction.
+        Returns the number of rows written.
+        """
+        today = timezone.localdate()
+        start = today - timedelta(days=days)
+        rows = ClickTracking.objects.filter(
+            created_at__gte=timezone.make_aware(datetime.combine(start, time.min)),
+            created_at__lt=timezone.make_aware(datetime.combine(today, time.min)),
+        ).annotate(
+            day=TruncDate('created_at')
+        ).values(
+            'day', 'page_type', 'country_code', 'region', 'referer_id'
+        ).annotate(
+            count=Count('id')
+        ).order_by()
+
+        with transaction.atomic():
+            cls.objects.filter(day__gte=start, day__lt=today).delete()
+            created = cls.objects.bulk_create([cls(**row) for row in rows.iterator()], batch_size=1000)
+        return len(created)
@@ -43,13 +43,15 @@ def check_existing_user_by_email(backend, details, response, social=None, *args,
             uid = str(response['id'])
         
         if uid:
-            social_auth = UserSocialAuth.objects.filter(
+            conflicts = UserSocialAuth.objects.filter(
                 provider=backend.name,
                 uid=uid
-            ).first()
+            ).exclude(user=existing_user)
             
-            if social_auth and social_auth.user != existing_user:
+            # Common path is a single EXISTS; the conflicting row is only loaded to report it
+            if conflicts.exists():
                 # Social account is associated with a different user
+                social_auth = conflicts.select_related('user').only('id', 'user__username').first()
                 logger.warning(
                     f"Social account {backend.name} (uid={uid}) is already associated with user {social_auth.user.username}, "
                     f"but email {email} belongs to user {existing_user.username}"
@@ -93,23 +95,26 @@ def create_user_profile(backend, user, response, *args, **kwargs):
     # Check if this is linking to an existing account
     social_account_linked = kwargs.get('social_account_linked', False)
     
-    # Create profile if it doesn't exist
-    profile, created = UserProfile.objects.get_or_create(user=user)
+    # Create profile if it doesn't exist, populated from social data in the same INSERT
+    defaults = {}
+    if backend.name == 'google-oauth2':
+        defaults = {
+            'first_name': response.get('given_name', ''),
+            'last_name': response.get('family_name', ''),
+        }
+    profile, created = UserProfile.objects.get_or_create(user=user, defaults=defaults)
     if created:
         logger.info(f"Created new profile for user: {user.username}")
-        
-        # Try to populate profile from social data
-        if backend.name == 'google-oauth2':
-            profile.first_name = response.get('given_name', '')
-            profile.last_name = response.get('family_name', '')
-            profile.save()
     
     # Mark email as verified and activate account for social auth
     if not user.is_email_verified:
         logger.info(f"Setting email as verified for social auth user: {user.username}")
         user.is_email_verified = True
-        user.is_active = True
-        user.save(update_fields=['is_email_verified', 'is_active'])
+        update_fields = ['is_email_verified']
+        if not user.is_active:
+            user.is_active = True
+            update_fields.append('is_active')
+        user.save(update_fields=update_fields)
     
     result = {'user': user, 'profile': profile}
     if social_account_linked:
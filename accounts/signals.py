@@ -0,0 +1,11 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from .models import ClickTracking
+
+
+@receiver(post_save, sender=ClickTracking)
+def invalidate_click_stats(sender, instance, created, **kwargs):
+    """New clicks make cached ClickTracking.get_stats() results stale"""
+    if created:
+        ClickTracking.bump_stats_version()
@@ -0,0 +1,59 @@
+import logging
+from smtplib import SMTPException
+
+from celery import shared_task
+from django.contrib.auth import get_user_model
+
+from .email_utils import smtp_connection
+
+logger = logging.getLogger(__name__)
+User = get_user_model()
+
+
+@shared_task(bind=True, autoretry_for=(SMTPException,), retry_backoff=True, max_retries=5)
+def send_verification_email_task(self, user_id, verification_url, domain):
+    """
+    Send the verification email off the request path.
+    verification_url is built by the view, which has the request.
+    """
+    from .views.emails import deliver_verification_email
+
+    user = User.objects.get(pk=user_id)
+    with smtp_connection() as connection:
+        deliver_verification_email(user, verification_url, domain, connection=connection)
+
+
+@shared_task(bind=True, autoretry_for=(SMTPException,), retry_backoff=True, max_retries=5)
+def send_welcome_email_task(self, user_id):
+    """Send the welcome email once per user, even if the task is queued twice"""
+    from .views.emails import deliver_welcome_email
+
+    # Claim the send atomically; a concurrent or repeated task finds the flag already set
+    if not User.objects.filter(pk=user_id, welcome_email_sent=False).update(welcome_email_sent=True):
+        return
+    try:
+        with smtp_connection() as connection:
+            deliver_welcome_email(User.objects.get(pk=user_id), connection=connection)
+    except Exception:
+        # Release the claim so the retry can send
+        User.objects.filter(pk=user_id).update(welcome_email_sent=False)
+        raise
+
+
+@shared_task
+def flush_clicks_task():
+    """Write the clicks queued by ClickTracking.record() (runs every few seconds via beat)"""
+    from .models import ClickTracking
+
+    return ClickTracking.flush_queue()
+
+
+@shared_task
+def rollup_clicks_task(days=None):
+    """Nightly rebuild of ClickTrackingDailyRollup for the last N complete days"""
+    from .models import ClickTrackingDailyRollup
+
+    days = days or ClickTrackingDailyRollup.REBUILD_DAYS
+    written = ClickTrackingDailyRollup.rebuild(days=days)
+    logger.info(f"Rebuilt {written} click tracking rollup rows for the last {days} days")
+    return written
@@ -1,11 +1,17 @@
+import logging
+
+from .models import ClickTracking
+
+logger = logging.getLogger('accounts')
+
+
 def get_client_ip(request):
     """Get client IP address from request"""
     x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
     if x_forwarded_for:
-        ip = x_forwarded_for.split(',')[0]
-    else:
-        ip = request.META.get('REMOTE_ADDR')
-    return ip
+        # First hop is the client; partition avoids building the full list of proxies
+        return x_forwarded_for.partition(',')[0].strip()
+    return request.META.get('REMOTE_ADDR')
 
 
 def track_click(request, page_type, **kwargs):
@@ -18,50 +24,32 @@ def track_click(request, page_type, **kwargs):
         **kwargs: Additional context (country_code, organization_name, region, etc.)
     
     Returns:
-        ClickTracking instance (or None if tracking fails, user is superuser, or user is premium)
+        True if the click was queued for a batched insert
+        (False if tracking fails, user is superuser, or user is premium)
     
     Note:
         Premium users (paid or provisional) are not tracked for privacy reasons.
     """
+    # Skip superusers and premium users before any other work. request.user was
+    # loaded by AuthenticationMiddleware for this request, so no SELECT is needed.
+    user = request.user if request.user.is_authenticated else None
+    if user is not None and (user.is_superuser or user.is_premium):
+        return False
+    
     try:
-        from .models import ClickTracking
-        
-        # Skip tracking for superusers and premium users
-        if request.user.is_authenticated:
-            try:
-                request.user.refresh_from_db()
-                if request.user.is_superuser:
-                    return None  # Don't track superuser clicks
-                # Check if user is premium
-                if hasattr(request.user, 'is_premium') and request.user.is_premium:
-                    return None  # Don't track premium user clicks
-            except Exception:
-                pass
-        
-        # Get user info
-        user = request.user if request.user.is_authenticated else None
-        is_authenticated = request.user.is_authenticated
-        is_premium = False
-        if is_authenticated:
-            try:
-                request.user.refresh_from_db()
-                is_premium = request.user.is_premium or request.user.is_superuser
-            except Exception:
-                pass
-        
         # Get request info
         ip_address = get_client_ip(request)
         user_agent = request.META.get('HTTP_USER_AGENT', '')[:500]
         referer = request.META.get('HTTP_REFERER', '')[:500]
         page_url = request.get_full_path()[:500]
         
-        # Create tracking record
-        tracking = ClickTracking.objects.create(
+        # Queue tracking record from plain values (written in batches off the request path)
+        ClickTracking.record(
             page_type=page_type,
             page_url=page_url,
-            user=user,
-            is_authenticated=is_authenticated,
-            is_premium=is_premium,
+            user_id=user.pk if user else None,
+            is_authenticated=user is not None,
+            is_premium=False,  # premium users returned early above
             ip_address=ip_address,
             user_agent=user_agent,
             referer=referer,
@@ -70,10 +58,8 @@ def track_click(request, page_type, **kwargs):
             region=kwargs.get('region', ''),
         )
         
-        return tracking
+        return True
     except Exception as e:
         # Silently fail tracking to not break the main functionality
-        import logging
-        logger = logging.getLogger('accounts')
         logger.error(f"Failed to track click: {e}", exc_info=True)
-        return None
+        return False
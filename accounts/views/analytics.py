@@ -2,14 +2,24 @@ import logging
 from django.shortcuts import render, redirect
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
+from django.core.cache import cache
 from django.utils import timezone
-from django.db.models import Count
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import ExtractHour
+from collections import Counter
 from datetime import timedelta
+from itertools import chain
 
-from ..models import ClickTracking
+from ..models import ClickTracking, ClickTrackingDailyRollup, Referer
 
 logger = logging.getLogger('accounts')
 
+ANALYTICS_CACHE_TIMEOUT = 300  # seconds
+TOTAL_RECORDS_CACHE_TIMEOUT = 60
+
+# Dashboard labels for page types, built once at import (same as the model's choice labels)
+PAGE_DISPLAY_NAMES = dict(ClickTracking.PAGE_CHOICES)
+
 
 @login_required
 def analytics_dashboard(request):
@@ -26,73 +36,99 @@ def analytics_dashboard(request):
     if days < 1 or days > 365:
         days = 30
     
+    cache_key = f'accounts:analytics:{days}'
+    context = cache.get(cache_key)
+    if context is None:
+        context = _build_dashboard_context(days)
+        cache.set(cache_key, context, ANALYTICS_CACHE_TIMEOUT)
+    
+    # Whole-table count, cached separately with a shorter TTL
+    context['total_tracking_records'] = cache.get_or_set(
+        'accounts:analytics:total', ClickTracking.objects.count, TOTAL_RECORDS_CACHE_TIMEOUT
+    )
+    
+    return render(request, 'accounts/analytics_dashboard.html', context)
+
+
+def _build_dashboard_context(days):
+    """Run the dashboard aggregations for the last N days"""
     # Get stats
     stats = ClickTracking.get_stats(days=days)
     
-    # Add display names to page stats
-    page_type_display_names = {
-        'signup': 'Sign Up',
-        'gatekeeper_directory': 'Gatekeeper Directory',
-        'gatekeeper_detail': 'Gatekeeper Detail',
-        'institution_rankings': 'Institution Rankings',
-        'institution_profile': 'Institution Profile',
-        'project_detail': 'Project Detail',
-        'regional_rankings': 'Regional Rankings',
-        'global_institution_rankings': 'Global Institution Rankings',
-        'gatekeeper_pdf': 'Gatekeeper PDF Download',
-        'regional_pdf': 'Regional PDF Download',
-    }
-    
     # Add display names to page_stats
     for page_stat in stats['page_stats']:
-        page_stat['display_name'] = page_type_display_names.get(
-            page_stat['page_type'], 
-            page_stat['page_type'].replace('_', ' ').title()
-        )
+        page_type = page_stat['page_type']
+        page_stat['display_name'] = PAGE_DISPLAY_NAMES.get(page_type) or page_type.replace('_', ' ').title()
     
     # Additional detailed stats
-    cutoff_date = timezone.now() - timedelta(days=days)
-    recent_clicks = ClickTracking.objects.filter(created_at__gte=cutoff_date)
+    # Same whole-day window as get_stats() and the rollup-backed breakdowns
+    recent_clicks = ClickTracking.objects.filter(created_at__gte=ClickTracking.window_start(days))
     
     # Hourly breakdown for last 24 hours
     last_24h = timezone.now() - timedelta(hours=24)
-    hourly_stats = recent_clicks.filter(created_at__gte=last_24h).extra(
-        select={'hour': "EXTRACT(HOUR FROM created_at)"}
+    hourly_stats = recent_clicks.filter(created_at__gte=last_24h).annotate(
+        hour=ExtractHour('created_at')
     ).values('hour').annotate(
         count=Count('id')
     ).order_by('hour')
     
     # Top referrers
-    top_referrers = recent_clicks.exclude(referer='').values('referer').annotate(
-        count=Count('id')
-    ).order_by('-count')[:10]
+    # Counts are per interned id; look up the text for the top 10 only
+    top_referer_counts = _window_counts('referer_id', days, recent_clicks, limit=10)
+    referer_texts = dict(Referer.objects.filter(
+        pk__in=[row['referer_id'] for row in top_referer_counts]
+    ).values_list('pk', 'text'))
+    top_referrers = [
+        {'referer': referer_texts.get(row['referer_id'], ''), 'count': row['count']}
+        for row in top_referer_counts
+    ]
     
     # User type breakdown (premium users are not tracked, so only anonymous and authenticated free users)
-    user_type_stats = {
-        'anonymous': recent_clicks.filter(is_authenticated=False).count(),
-        'authenticated_free': recent_clicks.filter(is_authenticated=True, is_premium=False).count(),
-        'authenticated_premium': recent_clicks.filter(is_premium=True).count(),
-    }
+    # One pass over the window with conditional counts
+    user_type_stats = recent_clicks.aggregate(
+        anonymous=Count('id', filter=Q(is_authenticated=False)),
+        authenticated_free=Count('id', filter=Q(is_authenticated=True, is_premium=False)),
+        authenticated_premium=Count('id', filter=Q(is_premium=True)),
+    )
     
     # Country breakdown (for country-specific pages)
-    country_stats = recent_clicks.exclude(country_code='').values('country_code').annotate(
-        count=Count('id')
-    ).order_by('-count')[:20]
+    country_stats = _window_counts('country_code', days, recent_clicks, limit=20)
     
     # Region breakdown
-    region_stats = recent_clicks.exclude(region='').values('region').annotate(
-        count=Count('id')
-    ).order_by('-count')
+    region_stats = _window_counts('region', days, recent_clicks)
     
-    context = {
+    return {
         'stats': stats,
         'hourly_stats': list(hourly_stats),
-        'top_referrers': list(top_referrers),
+        'top_referrers': top_referrers,
         'user_type_stats': user_type_stats,
-        'country_stats': list(country_stats),
-        'region_stats': list(region_stats),
+        'country_stats': country_stats,
+        'region_stats': region_stats,
         'days': days,
-        'total_tracking_records': ClickTracking.objects.count(),
     }
-    
-    return render(request, 'accounts/analytics_dashboard.html', context)
+
+
+def _window_counts(field, days, recent_clicks, limit=None):
+    """
+    Click counts per value of `field` over the window, skipping blank values.
+    Multi-day windows read complete days from ClickTrackingDailyRollup and only
+    count today's raw clicks; a 1-day window is counted from raw clicks directly.
+    """
+    blank = Q(**{field: None}) if field.endswith('_id') else Q(**{field: ''})
+
+    if days <= 1:
+        rows = recent_clicks.exclude(blank).values(field).annotate(count=Count('id')).order_by('-count')
+        return list(rows[:limit] if limit else rows)
+
+    today = timezone.localdate()
+    today_start = ClickTracking.window_start(1)
+    counts = Counter()
+    rollup = ClickTrackingDailyRollup.objects.filter(
+        day__gte=ClickTracking.window_start(days).date(), day__lt=today
+    ).exclude(blank).values(field).annotate(count=Sum('count')).order_by()
+    raw = ClickTracking.objects.filter(
+        created_at__gte=today_start
+    ).exclude(blank).values(field).annotate(count=Count('id')).order_by()
+    for row in chain(rollup, raw):
+        counts[row[field]] += row['count']
+    return [{field: value, 'count': count} for value, count in counts.most_common(limit)]
@@ -1,6 +1,6 @@
 import logging
 from django.shortcuts import render, redirect
-from django.contrib.auth import login, authenticate, get_user_model
+from django.contrib.auth import login, get_user_model
 from django.contrib import messages
 from django.utils import timezone
 from django.utils.http import url_has_allowed_host_and_scheme
@@ -9,7 +9,7 @@ from django.db import transaction
 from datetime import timedelta
 
 from ..forms import SignUpForm, LoginForm, ResendVerificationForm
-from ..models import UserProfile, EmailVerificationLog
+from ..models import UserProfile, EmailVerificationLog, hash_verification_token
 from ..utils import get_client_ip, track_click
 from .emails import send_verification_email
 
@@ -50,7 +50,7 @@ def signup_view(request):
                 # Log verification attempt
                 EmailVerificationLog.objects.create(
                     user=user,
-                    token=token,
+                    token=user.email_verification_token_hash,
                     ip_address=get_client_ip(request)
                 )
             
@@ -92,20 +92,10 @@ def login_view(request):
         form = LoginForm(request, data=request.POST)
         
         if form.is_valid():
-            username_or_email = form.cleaned_data.get('username')
-            password = form.cleaned_data.get('password')
             remember_me = form.cleaned_data.get('remember_me', False)
             
-            # Try to authenticate with username first
-            user = authenticate(username=username_or_email, password=password)
-            
-            # If failed, try with email as fallback
-            if user is None:
-                try:
-                    user_obj = User.objects.get(email=username_or_email.lower())
-                    user = authenticate(username=user_obj.username, password=password)
-                except User.DoesNotExist:
-                    pass
+            # The form already authenticated (username or email, see EmailOrUsernameBackend)
+            user = form.get_user()
             
             if user is not None:
                 # Superusers can bypass email verification and active checks
@@ -132,13 +122,9 @@ def login_view(request):
                 else:
                     request.session.set_expiry(1209600)  # 2 weeks
                 
-                # Log the user in
+                # Log the user in (login() also saves last_login via the update_last_login signal)
                 login(request, user)
                 
-                # Update last login
-                user.last_login = timezone.now()
-                user.save(update_fields=['last_login'])
-                
                 logger.info(f"User {user.email} logged in successfully")
                 
                 # Redirect to next URL or dashboard
@@ -165,10 +151,15 @@ def login_view(request):
 
 def verify_email(request, token):
     """Handle email verification"""
+    token_hash = hash_verification_token(token)
     try:
-        # Find user by token
-        user = User.objects.get(
-            email_verification_token=token,
+        # Find user by token hash (indexed). Only columns this view never reads are
+        # deferred: save(), the welcome email and login() need the rest, password included.
+        user = User.objects.defer(
+            'first_name', 'last_name', 'is_staff', 'is_premium', 'date_joined',
+            'last_login', 'searches_today', 'searches_reset_date',
+        ).get(
+            email_verification_token_hash=token_hash,
             is_email_verified=False
         )
         
@@ -197,12 +188,12 @@ def verify_email(request, token):
         # Log verification
         log = EmailVerificationLog.objects.filter(
             user=user,
-            token=token
+            token=token_hash
         ).first()
         if log:
             log.verified_at = timezone.now()
             log.ip_address = get_client_ip(request)
-            log.save()
+            log.save(update_fields=['verified_at', 'ip_address'])
         
         # Send welcome email
         from .emails import send_welcome_email
@@ -211,11 +202,7 @@ def verify_email(request, token):
         logger.info(f"Email verified for user {user.email}")
         
         # Automatically log the user in after successful verification
-        login(request, user, backend='django.contrib.auth.backends.ModelBackend')
-        
-        # Update last login
-        user.last_login = timezone.now()
-        user.save(update_fields=['last_login'])
+        login(request, user, backend='accounts.backends.EmailOrUsernameBackend')
         
         messages.success(
             request,
@@ -245,19 +232,21 @@ def resend_verification(request):
             email = form.cleaned_data.get('email').lower()
             
             try:
-                user = User.objects.get(email=email)
+                # Case-insensitive match served by the user_email_ci_uniq index
+                user = User.objects.get(email__iexact=email)
                 
                 if user.is_email_verified:
                     messages.info(request, 'This email is already verified. You can log in.')
                     return redirect('accounts:login')
                 
                 # Check rate limiting (max 3 emails per hour)
+                # Only whether 3 exist matters, so stop reading after the third row
                 recent_logs = EmailVerificationLog.objects.filter(
                     user=user,
                     sent_at__gte=timezone.now() - timedelta(hours=1)
-                ).count()
+                ).order_by().values_list('id', flat=True)[:3]
                 
-                if recent_logs >= 3:
+                if len(recent_logs) >= 3:
                     messages.error(
                         request,
                         'Too many verification emails sent. Please try again in an hour.'
@@ -266,12 +255,12 @@ def resend_verification(request):
                 
                 # Generate new token
                 token = user.generate_verification_token()
-                user.save()
+                user.save(update_fields=['email_verification_token_hash', 'email_verification_sent_at'])
                 
                 # Log new verification attempt
                 EmailVerificationLog.objects.create(
                     user=user,
-                    token=token,
+                    token=user.email_verification_token_hash,
                     ip_address=get_client_ip(request)
                 )
                 
@@ -1,62 +1,70 @@
+import functools
 import logging
 from django.core.mail import EmailMultiAlternatives
 from django.conf import settings
 from django.urls import reverse
-from django.template.loader import render_to_string
+from django.template.loader import get_template
 from django.contrib.sites.shortcuts import get_current_site
 
 logger = logging.getLogger('accounts')
 
 
+@functools.lru_cache(maxsize=1)
+def _site_urls():
+    """(site_url, login_url) for email links; fixed for the life of the worker process"""
+    from django.contrib.sites.models import Site
+
+    site_url = getattr(settings, 'SITE_URL', None) or f'http://{Site.objects.get_current().domain}'
+    return site_url, f"{site_url}{reverse('accounts:login')}"
+
+
 def send_verification_email(request, user, token):
-    """Send verification email to user"""
+    """
+    Queue the verification email for the Celery worker.
+    Only the absolute link is built here, since the task has no request.
+    """
+    from ..tasks import send_verification_email_task
+    
+    verification_url = request.build_absolute_uri(
+        reverse('accounts:verify_email', args=[token])
+    )
+    send_verification_email_task.delay(user.pk, verification_url, get_current_site(request).domain)
+
+
+def deliver_verification_email(user, verification_url, domain, connection=None):
+    """Render and send the verification email (runs in send_verification_email_task)"""
     try:
-        current_site = get_current_site(request)
-        verification_url = request.build_absolute_uri(
-            reverse('accounts:verify_email', args=[token])
-        )
-        
         subject = 'Verify your email address'
         
-        html_message = render_to_string('accounts/emails/email_verification.html', {
+        html_message = get_template('accounts/emails/email_verification.html').render({
             'user': user,
             'verification_url': verification_url,
-            'domain': current_site.domain,
+            'domain': domain,
             'site_name': 'QKB Intelligence',
         })
         
-        text_message = f"""
-        Welcome to QKB Intelligence!
-        
-        Please verify your email address by clicking the link below:
-        {verification_url}
-        
-        This link will expire in 24 hours.
-        
-        If you didn't create an account, please ignore this email.
-        """
+        text_message = get_template('accounts/emails/email_verification.txt').render({
+            'verification_url': verification_url,
+        })
         
         email = EmailMultiAlternatives(
             subject=subject,
             body=text_message,
             from_email=getattr(settings, 'DEFAULT_FROM_EMAIL', 'noreply@QKB Intelligence'),
-            to=[user.email]
+            to=[user.email],
+            connection=connection,
         )
         email.attach_alternative(html_message, "text/html")
         
-        # Log email configuration for debugging
-        logger.info(f"Attempting to send verification email to {user.email} from {getattr(settings, 'DEFAULT_FROM_EMAIL', 'noreply@QKB Intelligence')}")
-        logger.info(f"Email backend: {settings.EMAIL_BACKEND}")
-        
         # Send email
         email.send(fail_silently=False)
         
-        # Check Anymail status if available
-        if hasattr(email, 'anymail_status'):
-            logger.info(f"Anymail status: {email.anymail_status}")
-        if hasattr(email, 'anymail_status') and email.anymail_status.status:
-            for recipient, status in email.anymail_status.recipients.items():
-                logger.info(f"Email status for {recipient}: {status}")
+        # Backend details only when debugging; formatting them on every send is wasted work
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                f"Verification email to {user.email} from {email.from_email} via {settings.EMAIL_BACKEND}, "
+                f"anymail status: {getattr(email, 'anymail_status', None)}"
+            )
         
         logger.info(f"Verification email sent to {user.email}")
         
@@ -67,51 +75,46 @@ def send_verification_email(request, user, token):
 
 
 def send_welcome_email(user):
-    """Send welcome email after verification"""
-    # Prevent duplicate emails
+    """Queue the welcome email after verification"""
+    # Prevent duplicate emails (the task re-checks atomically before sending)
     if user.welcome_email_sent:
         return
     
+    from ..tasks import send_welcome_email_task
+    send_welcome_email_task.delay(user.pk)
+
+
+def deliver_welcome_email(user, connection=None):
+    """Render and send the welcome email (runs in send_welcome_email_task)"""
     try:
-        from django.contrib.sites.models import Site
-        
-        current_site = Site.objects.get_current()
-        site_url = getattr(settings, 'SITE_URL', f'http://{current_site.domain}')
-        login_url = f"{site_url}{reverse('accounts:login')}"
+        site_url, login_url = _site_urls()
         
         subject = 'Welcome to QKB Intelligence!'
         
-        html_message = render_to_string('accounts/emails/welcome_email.html', {
+        html_message = get_template('accounts/emails/welcome_email.html').render({
             'user': user,
             'login_url': login_url,
             'site_name': 'QKB Intelligence',
             'site_url': site_url,
         })
         
-        text_message = f"""
-        Welcome to QKB Intelligence!
-        
-        Your account has been successfully activated.
-        
-        You can now log in at: {login_url}
-        
-        Thank you for joining us!
-        """
+        text_message = get_template('accounts/emails/welcome_email.txt').render({
+            'login_url': login_url,
+        })
         
         email = EmailMultiAlternatives(
             subject=subject,
             body=text_message,
             from_email=getattr(settings, 'DEFAULT_FROM_EMAIL', 'noreply@QKB Intelligence'),
-            to=[user.email]
+            to=[user.email],
+            connection=connection,
         )
         email.attach_alternative(html_message, "text/html")
-        email.send(fail_silently=True)
-        
-        # Mark welcome email as sent
-        user.welcome_email_sent = True
-        user.save(update_fields=['welcome_email_sent'])
+        email.send(fail_silently=False)
         
         logger.info(f"Welcome email sent to {user.email}")
         
     except Exception as e:
         logger.error(f"Failed to send welcome email to {user.email}: {e}")
+        # Re-raise so the task can retry
+        raise
@@ -42,8 +42,9 @@ def request_access(request):
             initial['plan'] = plan
         if request.user.is_authenticated:
             initial['email'] = request.user.email
-            if hasattr(request.user, 'profile'):
-                profile = request.user.profile
+            # Joined by EmailOrUsernameBackend.get_user; None when the user has no profile
+            profile = getattr(request.user, 'profile', None)
+            if profile is not None:
                 name_parts = [profile.first_name, profile.last_name]
                 full = ' '.join(p for p in name_parts if p)
                 if full:
@@ -1,9 +1,10 @@
+import json
 import logging
 from django.shortcuts import render, redirect
 from django.contrib.auth.decorators import login_required
-from django.contrib.auth import logout
+from django.contrib.auth import logout, get_user_model
 from django.contrib import messages
-from django.http import JsonResponse
+from django.http import HttpResponse
 from django.utils import timezone
 from django.views.decorators.http import require_POST
 
@@ -11,6 +12,7 @@ from ..forms import ProfileUpdateForm
 from ..models import UserProfile
 
 logger = logging.getLogger('accounts')
+User = get_user_model()
 
 
 @login_required
@@ -19,10 +21,11 @@ def dashboard(request):
     from datetime import date
 
     user = request.user
-    profile, created = UserProfile.objects.get_or_create(user=user)
+    # Signup and the social pipeline create the profile; only accounts predating that fall through
+    profile = getattr(user, 'profile', None) or UserProfile.objects.get_or_create(user=user)[0]
 
     # Search usage stats
-    is_premium = user.is_premium or user.is_superuser
+    is_premium = user.is_premium_effective
     daily_limit = 0 if is_premium else 10
     today = date.today()
     searches_today = user.searches_today if user.searches_reset_date == today else 0
@@ -45,7 +48,7 @@ def dashboard(request):
 @login_required
 def profile_update(request):
     """Update user profile"""
-    profile, created = UserProfile.objects.get_or_create(user=request.user)
+    profile = getattr(request.user, 'profile', None) or UserProfile.objects.get_or_create(user=request.user)[0]
     
     if request.method == 'POST':
         form = ProfileUpdateForm(request.POST, request.FILES, instance=profile)
@@ -73,13 +76,16 @@ def logout_view(request):
 @login_required
 def export_data(request):
     """Export user data in JSON format (GDPR Right to Data Portability)"""
-    user = request.user
+    user = User.objects.select_related('profile').prefetch_related(
+        'verification_logs'
+    ).get(pk=request.user.pk)
     data = user.export_data()
     
-    response = JsonResponse(data, json_dumps_params={'indent': 2})
+    # export_data() already returns plain JSON types, so skip DjangoJSONEncoder.
+    # Without indent, json.dumps takes the C encoder path.
+    response = HttpResponse(json.dumps(data), content_type='application/json')
     filename = f"user_data_{user.username}_{timezone.now().strftime('%Y%m%d')}.json"
     response['Content-Disposition'] = f'attachment; filename="{filename}"'
-    response['Content-Type'] = 'application/json'
     
     logger.info(f"User {user.email} exported their data")
     return response
@@ -99,8 +105,9 @@ def delete_account(request):
     # Log the deletion
     logger.info(f"User {user.email} requested account deletion")
     
-    # Delete user (CASCADE will handle related objects)
-    email = user.email
+    # Delete user. No delete signals are registered for the related models, so the
+    # collector issues one DELETE per CASCADE table and one UPDATE per SET_NULL table
+    # (clicks, pricing inquiries) without fetching the related rows first.
     user.delete()
     
     # Logout user
@@ -1,20 +1,34 @@
 from django.contrib import admin
-from .models import Company, Shareholder, LegalRepresentative, OwnershipChange, Tender, ScrapeLog
+from django.contrib.postgres.search import SearchQuery
+from django.db.models import Q
+from django.db.models.functions import Left
+from .models import Company, Shareholder, LegalRepresentative, OwnershipChange, Authority, Tender, ScrapeLog
 
 
-class ShareholderInline(admin.TabularInline):
+class CompanyChildInline(admin.TabularInline):
+    """
+    Each inline row prints str(obj), which reads obj.company.name. The formset only sets
+    company_id on its rows, so join the (narrowed) company instead of one SELECT per row.
+    """
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('company').defer(
+            *(f'company__{name}' for name in Company.LIST_DEFERRED_FIELDS)
+        )
+
+
+class ShareholderInline(CompanyChildInline):
     model = Shareholder
     fk_name = 'company'
     extra = 0
     fields = ['shareholder_type', 'full_name', 'parent_company_name', 'ownership_pct', 'effective_date']
 
 
-class LegalRepresentativeInline(admin.TabularInline):
+class LegalRepresentativeInline(CompanyChildInline):
     model = LegalRepresentative
     extra = 0
 
 
-class OwnershipChangeInline(admin.TabularInline):
+class OwnershipChangeInline(CompanyChildInline):
     model = OwnershipChange
     extra = 0
     fields = ['change_date', 'description']
@@ -47,10 +61,38 @@ class CompanyAdmin(admin.ModelAdmin):
         }),
     )
 
+    def get_queryset(self, request):
+        # search_vector, raw_html_gz and names_blob are never shown; raw_pdf_text (often many KB)
+        # and the other free-text columns only on the change form
+        qs = super().get_queryset(request).defer('search_vector', 'raw_html_gz', 'names_blob')
+        match = request.resolver_match
+        if match and match.url_name == f'{self.opts.app_label}_{self.opts.model_name}_changelist':
+            qs = qs.defer(*Company.LIST_DEFERRED_FIELDS)
+        return qs
+
+    def get_search_results(self, request, queryset, search_term):
+        """
+        Match NIPTs by prefix; anything else matches whole words through the search_vector
+        GIN index or substrings of the names through the trigram indexes.
+        """
+        term = search_term.strip()
+        if not term:
+            return queryset, False
+
+        # A single token containing digits is a (partial) NIPT; NIPTs are stored uppercase
+        if term.isalnum() and any(c.isdigit() for c in term):
+            return queryset.filter(nipt__startswith=term.upper()), False
+
+        query = SearchQuery(term, search_type='websearch', config='simple')
+        return queryset.filter(
+            Q(search_vector=query) | Q(name__icontains=term) | Q(name_latin__icontains=term)
+        ), False
+
 
 @admin.register(Shareholder)
 class ShareholderAdmin(admin.ModelAdmin):
     list_display = ['full_name', 'company', 'shareholder_type', 'ownership_pct', 'effective_date']
+    list_select_related = ['company']
     list_filter = ['shareholder_type']
     search_fields = ['full_name', 'parent_company_name', 'company__name']
     raw_id_fields = ['company', 'parent_company']
@@ -59,16 +101,26 @@ class ShareholderAdmin(admin.ModelAdmin):
 @admin.register(LegalRepresentative)
 class LegalRepresentativeAdmin(admin.ModelAdmin):
     list_display = ['full_name', 'role', 'company', 'appointed_date']
+    list_select_related = ['company']
     search_fields = ['full_name', 'company__name']
     raw_id_fields = ['company']
 
 
+@admin.register(Authority)
+class AuthorityAdmin(admin.ModelAdmin):
+    list_display = ['name', 'authority_type']
+    list_filter = ['authority_type']
+    search_fields = ['name']
+
+
 @admin.register(Tender)
 class TenderAdmin(admin.ModelAdmin):
-    list_display = ['winner_name', 'authority_name', 'title_short', 'contract_value_fmt', 'procedure_type', 'status', 'bulletin_date']
+    list_display = ['winner_name', 'authority', 'title_short', 'contract_value_fmt', 'procedure_type', 'status', 'bulletin_date']
+    list_select_related = ['authority']
     list_filter = ['status', 'procedure_type', 'bulletin_date']
-    search_fields = ['winner_name', 'winner_nipt', 'authority_name', 'title', 'reference_number']
+    search_fields = ['winner_name', 'winner_nipt', 'authority__name', 'title', 'reference_number']
     raw_id_fields = ['winner_company']
+    autocomplete_fields = ['authority']
     date_hierarchy = 'bulletin_date'
     readonly_fields = ['created_at', 'updated_at']
 
@@ -77,7 +129,7 @@ class TenderAdmin(admin.ModelAdmin):
             'fields': ('bulletin_number', 'bulletin_date', 'reference_number')
         }),
         ('Contracting Authority', {
-            'fields': ('authority_name', 'authority_type')
+            'fields': ('authority',)
         }),
         ('Procurement', {
             'fields': ('title', 'procedure_type', 'status')
@@ -97,9 +149,30 @@ class TenderAdmin(admin.ModelAdmin):
         }),
     )
 
+    # Columns the change-list renders; title is fetched as a 61-char prefix (see title_short)
+    changelist_only_fields = (
+        'id', 'winner_name', 'authority', 'authority__name', 'contract_value',
+        'procedure_type', 'status', 'bulletin_date',
+    )
+
+    def get_queryset(self, request):
+        qs = super().get_queryset(request)
+        match = request.resolver_match
+        if match and match.url_name == f'{self.opts.app_label}_{self.opts.model_name}_changelist':
+            # One character past the cut-off tells title_short whether to add the ellipsis
+            qs = qs.only(*self.changelist_only_fields).annotate(title_prefix=Left('title', 61))
+        return qs
+
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        Tender.bulk_link_winners([obj])
+
     @admin.display(description='Title')
     def title_short(self, obj):
-        return obj.title[:60] + '...' if len(obj.title) > 60 else obj.title
+        title = getattr(obj, 'title_prefix', None)
+        if title is None:
+            title = obj.title
+        return title[:60] + '...' if len(title) > 60 else title
 
     @admin.display(description='Value (lekë)')
     def contract_value_fmt(self, obj):
@@ -1,4 +1,5 @@
 from django.core.management.base import BaseCommand
+from django.db.models import OuterRef, Subquery
 from companies.models import Tender, Company
 
 
@@ -9,18 +10,18 @@ class Command(BaseCommand):
         unlinked = Tender.objects.filter(
             winner_company__isnull=True,
         ).exclude(winner_nipt='')
+        # Counted once up front (tender_unlinked_nipt_idx); what remains is derived below
+        initial_unlinked = unlinked.count()
 
-        linked_count = 0
-        for tender in unlinked:
-            try:
-                company = Company.objects.get(nipt=tender.winner_nipt)
-                tender.winner_company = company
-                tender.save(update_fields=['winner_company'])
-                linked_count += 1
-                self.stdout.write(f"  Linked: {tender.winner_nipt} → {company.name}")
-            except Company.DoesNotExist:
-                continue
+        # One UPDATE ... SET winner_company_id = (SELECT id FROM company WHERE nipt = winner_nipt)
+        linked_count = unlinked.filter(
+            winner_nipt__in=Company.objects.values('nipt'),
+        ).update(
+            winner_company=Subquery(
+                Company.objects.filter(nipt=OuterRef('winner_nipt')).order_by().values('pk')[:1]
+            ),
+        )
 
         self.stdout.write(self.style.SUCCESS(
-            f"Done. Linked {linked_count} tenders, {unlinked.count()} still unlinked."
+            f"Done. Linked {linked_count} tenders, {initial_unlinked - linked_count} still unlinked."
         ))
@@ -1,16 +1,10 @@
 from django.core.management.base import BaseCommand
-from django.contrib.postgres.search import SearchVector
-
-from companies.models import Company
 
 
 class Command(BaseCommand):
-    help = 'Backfill search_vector for all existing companies'
+    help = 'No-op: search_vector is a generated column maintained by the database'
 
     def handle(self, *args, **options):
-        count = Company.objects.count()
-        self.stdout.write(f'Updating search vectors for {count} companies...')
-        Company.objects.update(
-            search_vector=SearchVector('name', 'name_latin', 'nipt', 'city')
-        )
-        self.stdout.write(self.style.SUCCESS(f'Done — {count} companies updated.'))
+        self.stdout.write(self.style.SUCCESS(
+            'search_vector is maintained by the database; nothing to backfill.'
+        ))
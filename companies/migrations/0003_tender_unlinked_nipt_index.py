@@ -0,0 +1,17 @@
+# Generated by Django 6.0.2 on 2026-10-15 04:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies', '0002_tender'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='tender',
+            index=models.Index(condition=models.Q(('winner_company__isnull', True), models.Q(('winner_nipt', ''), _negated=True)), fields=['winner_nipt'], name='tender_unlinked_nipt_idx'),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 6.0.2 on 2026-10-15 04:40
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """
+    Generated columns cannot be altered in place, so the plain column (and its
+    GIN index) is dropped and re-added as GENERATED ALWAYS ... STORED.
+    PostgreSQL computes the value for every existing row while adding it.
+    """
+
+    dependencies = [
+        ('companies', '0003_tender_unlinked_nipt_index'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='company',
+            name='companies_c_search__af2048_gin',
+        ),
+        migrations.RemoveField(
+            model_name='company',
+            name='search_vector',
+        ),
+        migrations.AddField(
+            model_name='company',
+            name='search_vector',
+            field=models.GeneratedField(db_persist=True, expression=django.contrib.postgres.search.SearchVector('name', 'name_latin', 'nipt', 'city', config='simple'), output_field=django.contrib.postgres.search.SearchVectorField()),
+        ),
+        migrations.AddIndex(
+            model_name='company',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='companies_c_search__af2048_gin'),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 6.0.2 on 2026-10-15 04:50
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """Re-create the generated column with a weighted expression (generated columns cannot be altered)"""
+
+    dependencies = [
+        ('companies', '0004_company_search_vector_generated'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='company',
+            name='companies_c_search__af2048_gin',
+        ),
+        migrations.RemoveField(
+            model_name='company',
+            name='search_vector',
+        ),
+        migrations.AddField(
+            model_name='company',
+            name='search_vector',
+            field=models.GeneratedField(db_persist=True, expression=django.contrib.postgres.search.CombinedSearchVector(django.contrib.postgres.search.CombinedSearchVector(django.contrib.postgres.search.CombinedSearchVector(django.contrib.postgres.search.SearchVector('name', 'nipt', config='simple', weight='A'), '||', django.contrib.postgres.search.SearchVector('name_latin', config='simple', weight='B'), django.contrib.postgres.search.SearchConfig('simple')), '||', django.contrib.postgres.search.SearchVector('city', 'nace_description', config='simple', weight='C'), django.contrib.postgres.search.SearchConfig('simple')), '||', django.contrib.postgres.search.SearchVector(django.db.models.functions.text.Left('raw_pdf_text', 100000), config='simple', weight='D'), django.contrib.postgres.search.SearchConfig('simple')), output_field=django.contrib.postgres.search.SearchVectorField()),
+        ),
+        migrations.AddIndex(
+            model_name='company',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='companies_c_search__af2048_gin'),
+        ),
+    ]
@@ -0,0 +1,67 @@
+# Generated by Django 6.0.2 on 2026-10-15 05:00
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import TrigramExtension
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies', '0005_company_search_vector_weighted'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.RemoveIndex(
+            model_name='legalrepresentative',
+            name='companies_l_full_na_a53919_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='shareholder',
+            name='companies_s_full_na_af19f0_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='tender',
+            name='companies_t_authori_67e21e_idx',
+        ),
+        migrations.AlterField(
+            model_name='legalrepresentative',
+            name='full_name',
+            field=models.CharField(max_length=300),
+        ),
+        migrations.AlterField(
+            model_name='shareholder',
+            name='full_name',
+            field=models.CharField(blank=True, max_length=300),
+        ),
+        migrations.AddIndex(
+            model_name='company',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('name'), name='gin_trgm_ops'), name='company_name_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='company',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('name_latin'), name='gin_trgm_ops'), name='company_name_latin_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='legalrepresentative',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('full_name'), name='gin_trgm_ops'), name='legalrep_full_name_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='shareholder',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('full_name'), name='gin_trgm_ops'), name='shareholder_full_name_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='shareholder',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('parent_company_name'), name='gin_trgm_ops'), name='shareholder_parent_name_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='tender',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('authority_name'), name='gin_trgm_ops'), name='tender_authority_name_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='tender',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('winner_name'), name='gin_trgm_ops'), name='tender_winner_name_trgm'),
+        ),
+    ]
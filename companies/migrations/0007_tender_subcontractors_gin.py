@@ -0,0 +1,18 @@
+# Generated by Django 6.0.2 on 2026-10-15 05:10
+
+import django.contrib.postgres.indexes
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies', '0006_trigram_name_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='tender',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['subcontractors'], name='tender_subcontractors_gin', opclasses=['jsonb_path_ops']),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 6.0.2 on 2026-10-15 05:20
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies', '0007_tender_subcontractors_gin'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='tender',
+            name='companies_t_bulleti_222894_idx',
+        ),
+        migrations.AlterField(
+            model_name='tender',
+            name='winner_company',
+            field=models.ForeignKey(blank=True, db_index=False, help_text='Link to company in our DB (auto-linked by NIPT)', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='tenders_won', to='companies.company'),
+        ),
+        migrations.AddIndex(
+            model_name='tender',
+            index=models.Index(fields=['-bulletin_date', '-contract_date'], name='tender_bulletin_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tender',
+            index=models.Index(fields=['winner_company', '-bulletin_date', '-contract_date'], name='tender_winner_order_idx'),
+        ),
+    ]
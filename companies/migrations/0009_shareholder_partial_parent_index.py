@@ -0,0 +1,27 @@
+# Generated by Django 6.0.2 on 2026-10-15 05:30
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies', '0008_tender_ordering_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='shareholder',
+            name='companies_s_company_2c373b_idx',
+        ),
+        migrations.AlterField(
+            model_name='shareholder',
+            name='parent_company',
+            field=models.ForeignKey(blank=True, db_index=False, help_text='If shareholder is another company in our DB', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='subsidiaries', to='companies.company'),
+        ),
+        migrations.AddIndex(
+            model_name='shareholder',
+            index=models.Index(condition=models.Q(('parent_company__isnull', False)), fields=['parent_company'], name='shareholder_parent_fk_idx'),
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 6.0.2 on 2026-10-15 05:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+# Explode the existing JSON snapshots in one statement. Older snapshots never stored
+# NIPTs, so those rows get nipt = ''.
+BACKFILL_SQL = """
+INSERT INTO companies_ownershipsnapshot (change_id, side, name, nipt, pct)
+SELECT oc.id, s.side, LEFT(COALESCE(r.name, ''), 300), '', NULLIF(NULLIF(r.pct, ''), 'None')::numeric
+FROM companies_ownershipchange AS oc
+CROSS JOIN LATERAL (
+    VALUES ('old', oc.old_shareholders), ('new', oc.new_shareholders)
+) AS s(side, snapshot)
+CROSS JOIN LATERAL jsonb_to_recordset(s.snapshot) AS r(name text, pct text);
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies', '0009_shareholder_partial_parent_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OwnershipSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('side', models.CharField(choices=[('old', 'Before'), ('new', 'After')], max_length=3)),
+                ('name', models.CharField(max_length=300)),
+                ('nipt', models.CharField(blank=True, help_text='Shareholder NIPT, when the shareholder is a company', max_length=20)),
+                ('pct', models.DecimalField(blank=True, decimal_places=2, max_digits=6, null=True)),
+                ('change', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='snapshots', to='companies.ownershipchange')),
+            ],
+            options={
+                'indexes': [models.Index(condition=models.Q(('nipt', ''), _negated=True), fields=['nipt', 'side'], name='ownsnap_nipt_side_idx')],
+            },
+        ),
+        migrations.RunSQL(BACKFILL_SQL, migrations.RunSQL.noop),
+    ]
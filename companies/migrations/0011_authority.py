@@ -0,0 +1,69 @@
+# Generated by Django 6.0.2 on 2026-10-15 05:50
+
+import django.contrib.postgres.indexes
+import django.db.models.deletion
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+# One Authority row per distinct name; tenders then point at it by id
+BACKFILL_SQL = """
+INSERT INTO companies_authority (name, authority_type)
+SELECT authority_name, MAX(authority_type)
+FROM companies_tender
+GROUP BY authority_name;
+
+UPDATE companies_tender t
+SET authority_id = a.id
+FROM companies_authority a
+WHERE a.name = t.authority_name;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies', '0010_ownership_snapshot'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Authority',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(help_text='Contracting authority name', max_length=500, unique=True)),
+                ('authority_type', models.CharField(blank=True, help_text='e.g., SH.A, Ministry, Municipality', max_length=100)),
+            ],
+            options={
+                'verbose_name_plural': 'authorities',
+                'ordering': ['name'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='authority',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('name'), name='gin_trgm_ops'), name='authority_name_trgm'),
+        ),
+        migrations.AddField(
+            model_name='tender',
+            name='authority',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.PROTECT, related_name='tenders', to='companies.authority'),
+        ),
+        migrations.RunSQL(BACKFILL_SQL, reverse_sql=migrations.RunSQL.noop),
+        migrations.RemoveIndex(
+            model_name='tender',
+            name='tender_authority_name_trgm',
+        ),
+        migrations.RemoveField(
+            model_name='tender',
+            name='authority_name',
+        ),
+        migrations.RemoveField(
+            model_name='tender',
+            name='authority_type',
+        ),
+        migrations.AlterField(
+            model_name='tender',
+            name='authority',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='tenders', to='companies.authority'),
+        ),
+    ]
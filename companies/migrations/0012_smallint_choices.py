@@ -0,0 +1,68 @@
+# Generated by Django 6.0.2 on 2026-10-15 06:05
+
+from django.db import migrations, models
+from django.db.models import Case, F, Value, When
+
+
+# Old string value -> new smallint per (model, field), plus the code for unrecognised strings
+CODES = {
+    ('company', 'legal_form'): ({'shpk': 1, 'sha': 2, 'pf': 3, 'deg': 4, 'other': 5}, 5),
+    ('company', 'status'): ({'active': 1, 'suspended': 2, 'dissolved': 3, 'bankruptcy': 4, 'in_liquidation': 5}, 1),
+    ('tender', 'procedure_type'): ({
+        'open': 1, 'restricted': 2, 'negotiated': 3, 'proposal': 4,
+        'consultancy': 5, 'small_value': 6, 'design_contest': 7, 'other': 8,
+    }, 8),
+    ('tender', 'status'): ({'awarded': 1, 'cancelled': 2, 'appealed': 3}, 1),
+}
+
+
+def _remap(apps, forward):
+    """One UPDATE per column, rewriting the codes in place while the columns are still varchar"""
+    for (model_name, field), (codes, fallback) in CODES.items():
+        if forward:
+            whens = [When(**{field: old}, then=Value(str(new))) for old, new in codes.items()]
+            default = Value(str(fallback))
+        else:
+            whens = [When(**{field: str(new)}, then=Value(old)) for old, new in codes.items()]
+            default = F(field)
+        model = apps.get_model('companies', model_name)
+        model.objects.update(**{field: Case(*whens, default=default)})
+
+
+def strings_to_codes(apps, schema_editor):
+    _remap(apps, forward=True)
+
+
+def codes_to_strings(apps, schema_editor):
+    _remap(apps, forward=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies', '0011_authority'),
+    ]
+
+    operations = [
+        migrations.RunPython(strings_to_codes, codes_to_strings),
+        migrations.AlterField(
+            model_name='company',
+            name='legal_form',
+            field=models.PositiveSmallIntegerField(choices=[(1, 'Sh.P.K. (LLC)'), (2, 'Sh.A. (Joint Stock)'), (3, 'Person Fizik (Sole Proprietor)'), (4, 'Degë e Shoqërisë së Huaj (Foreign Branch)'), (5, 'Other')], default=1),
+        ),
+        migrations.AlterField(
+            model_name='company',
+            name='status',
+            field=models.PositiveSmallIntegerField(choices=[(1, 'Aktiv'), (2, 'Pezulluar'), (3, 'Çregjistruar'), (4, 'Falimentuar'), (5, 'Në Likuidim')], default=1),
+        ),
+        migrations.AlterField(
+            model_name='tender',
+            name='procedure_type',
+            field=models.PositiveSmallIntegerField(choices=[(1, 'Procedurë e Hapur'), (2, 'Procedurë e Kufizuar'), (3, 'Procedurë me Negocim'), (4, 'Kërkesë për Propozim'), (5, 'Shërbim Konsulence'), (6, 'Vlerë e Vogël'), (7, 'Konkurs Projektimi'), (8, 'Other')], default=1),
+        ),
+        migrations.AlterField(
+            model_name='tender',
+            name='status',
+            field=models.PositiveSmallIntegerField(choices=[(1, 'Awarded'), (2, 'Cancelled'), (3, 'Appealed')], default=1),
+        ),
+    ]
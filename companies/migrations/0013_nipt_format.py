@@ -0,0 +1,54 @@
+# Generated by Django 6.0.2 on 2026-10-15 06:20
+
+from django.db import migrations, models
+
+NIPT_FORMAT = r'^[A-Z][0-9]{7,9}[A-Z]$'
+
+
+def validate_nipt_format(apps, schema_editor):
+    """
+    Validate nipt_format when every existing row conforms; otherwise list the rows that
+    don't and leave the constraint NOT VALID (still enforced on insert and update) so the
+    deploy isn't blocked. Fix or remove those rows, then run
+    ALTER TABLE companies_company VALIDATE CONSTRAINT nipt_format;
+    """
+    Company = apps.get_model('companies', 'Company')
+    malformed = list(Company.objects.exclude(nipt__regex=NIPT_FORMAT).values_list('pk', 'nipt'))
+    if malformed:
+        print(f"\n  nipt_format left NOT VALID: {len(malformed)} row(s) do not match {NIPT_FORMAT}")
+        for pk, nipt in malformed:
+            print(f"    id={pk} nipt={nipt!r}")
+        return
+    schema_editor.execute('ALTER TABLE companies_company VALIDATE CONSTRAINT nipt_format')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies', '0012_smallint_choices'),
+    ]
+
+    operations = [
+        # Older rows were saved without normalising case/whitespace
+        migrations.RunSQL(
+            "UPDATE companies_company SET nipt = UPPER(BTRIM(nipt)) WHERE nipt <> UPPER(BTRIM(nipt));",
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        # Added NOT VALID so rows that still fail the pattern don't abort the migration
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AddConstraint(
+                    model_name='company',
+                    constraint=models.CheckConstraint(condition=models.Q(('nipt__regex', '^[A-Z][0-9]{7,9}[A-Z]$')), name='nipt_format'),
+                ),
+            ],
+            database_operations=[
+                migrations.RunSQL(
+                    "ALTER TABLE companies_company ADD CONSTRAINT nipt_format "
+                    "CHECK (nipt ~ '^[A-Z][0-9]{7,9}[A-Z]$') NOT VALID;",
+                    reverse_sql="ALTER TABLE companies_company DROP CONSTRAINT nipt_format;",
+                ),
+            ],
+        ),
+        migrations.RunPython(validate_nipt_format, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 6.0.2 on 2026-10-15 06:35
+
+import django.db.models.functions.comparison
+from django.contrib.postgres.operations import CreateCollation
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies', '0013_nipt_format'),
+    ]
+
+    operations = [
+        CreateCollation('albanian', provider='icu', locale='sq-AL'),
+        migrations.AlterModelOptions(
+            name='company',
+            options={'ordering': ['name_sort'], 'verbose_name_plural': 'companies'},
+        ),
+        migrations.AddField(
+            model_name='company',
+            name='name_sort',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.functions.comparison.Collate('name', 'albanian'), output_field=models.CharField(db_collation='albanian', max_length=500)),
+        ),
+        migrations.AlterField(
+            model_name='company',
+            name='name',
+            field=models.CharField(max_length=500),
+        ),
+        migrations.AddIndex(
+            model_name='company',
+            index=models.Index(fields=['name_sort'], name='company_name_sort_idx'),
+        ),
+    ]
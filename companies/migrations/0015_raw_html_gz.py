@@ -0,0 +1,18 @@
+# Generated by Django 6.0.2 on 2026-10-15 06:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies', '0014_name_sort'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='company',
+            name='raw_html_gz',
+            field=models.BinaryField(blank=True, help_text='Scraped detail page, gzipped', null=True),
+        ),
+    ]
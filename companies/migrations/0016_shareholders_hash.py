@@ -0,0 +1,18 @@
+# Generated by Django 6.0.2 on 2026-10-15 07:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies', '0015_raw_html_gz'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='company',
+            name='shareholders_hash',
+            field=models.CharField(blank=True, editable=False, max_length=16),
+        ),
+    ]
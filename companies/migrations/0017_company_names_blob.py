@@ -0,0 +1,50 @@
+# Generated by Django 6.0.2 on 2026-10-15 07:20
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+# Seed names_blob from the rows already stored; the scraper keeps it current afterwards
+BACKFILL_SQL = """
+UPDATE companies_company c
+SET names_blob = concat_ws(' ',
+    (SELECT string_agg(full_name, ' ') FROM companies_shareholder WHERE company_id = c.id),
+    (SELECT string_agg(full_name, ' ') FROM companies_legalrepresentative WHERE company_id = c.id)
+);
+"""
+
+
+class Migration(migrations.Migration):
+    """Add names_blob and re-create the generated column over it (generated columns cannot be altered)"""
+
+    dependencies = [
+        ('companies', '0016_shareholders_hash'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='company',
+            name='names_blob',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.RunSQL(BACKFILL_SQL, reverse_sql=migrations.RunSQL.noop),
+        migrations.RemoveIndex(
+            model_name='company',
+            name='companies_c_search__af2048_gin',
+        ),
+        migrations.RemoveField(
+            model_name='company',
+            name='search_vector',
+        ),
+        migrations.AddField(
+            model_name='company',
+            name='search_vector',
+            field=models.GeneratedField(db_persist=True, expression=django.contrib.postgres.search.CombinedSearchVector(django.contrib.postgres.search.CombinedSearchVector(django.contrib.postgres.search.CombinedSearchVector(django.contrib.postgres.search.SearchVector('name', 'nipt', config='simple', weight='A'), '||', django.contrib.postgres.search.SearchVector('name_latin', 'names_blob', config='simple', weight='B'), django.contrib.postgres.search.SearchConfig('simple')), '||', django.contrib.postgres.search.SearchVector('city', 'nace_description', config='simple', weight='C'), django.contrib.postgres.search.SearchConfig('simple')), '||', django.contrib.postgres.search.SearchVector(django.db.models.functions.text.Left('raw_pdf_text', 100000), config='simple', weight='D'), django.contrib.postgres.search.SearchConfig('simple')), output_field=django.contrib.postgres.search.SearchVectorField()),
+        ),
+        migrations.AddIndex(
+            model_name='company',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='companies_c_search__af2048_gin'),
+        ),
+    ]
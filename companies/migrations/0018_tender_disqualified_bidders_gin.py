@@ -0,0 +1,18 @@
+# Generated by Django 6.0.2 on 2026-10-15 07:40
+
+import django.contrib.postgres.indexes
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies', '0017_company_names_blob'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='tender',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['disqualified_bidders'], name='tender_disq_gin', opclasses=['jsonb_path_ops']),
+        ),
+    ]
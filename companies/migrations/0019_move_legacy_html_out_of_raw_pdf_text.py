@@ -0,0 +1,35 @@
+# Generated by Django 6.0.2 on 2026-10-15 07:45
+
+import gzip
+
+from django.db import migrations
+
+BATCH_SIZE = 500
+
+
+def move_html(apps, schema_editor):
+    """
+    Rows scraped before raw_html_gz still hold (up to 50 KB of) the detail page's HTML in
+    raw_pdf_text, which the generated search_vector indexes. Move it to raw_html_gz (unless a
+    newer scrape already stored the page there) and blank raw_pdf_text; the next scrape fills
+    it with the registry text.
+    """
+    Company = apps.get_model('companies', 'Company')
+    legacy = Company.objects.filter(raw_pdf_text__regex=r'^\s*<').order_by()
+    while batch := list(legacy.only('pk', 'raw_pdf_text', 'raw_html_gz')[:BATCH_SIZE]):
+        for company in batch:
+            if company.raw_html_gz is None:
+                company.raw_html_gz = gzip.compress(company.raw_pdf_text.encode('utf-8'))
+            company.raw_pdf_text = ''
+        Company.objects.bulk_update(batch, ['raw_pdf_text', 'raw_html_gz'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies', '0018_tender_disqualified_bidders_gin'),
+    ]
+
+    operations = [
+        migrations.RunPython(move_html, migrations.RunPython.noop),
+    ]
@@ -1,6 +1,18 @@
-from django.db import models
-from django.contrib.postgres.search import SearchVectorField
-from django.contrib.postgres.indexes import GinIndex
+from django.db import models, transaction
+from django.db.models.functions import Collate, Left, Upper
+from django.contrib.postgres.search import SearchVector, SearchVectorField
+from django.contrib.postgres.indexes import GinIndex, OpClass
+
+
+# Stored NIPT shape: letter, digits, letter, uppercase only (the nipt_format constraint)
+NIPT_FORMAT = r'^[A-Z][0-9]{7,9}[A-Z]$'
+
+
+class CompanyListManager(models.Manager):
+    """Companies for list pages and cards: the long text columns are deferred"""
+
+    def get_queryset(self):
+        return super().get_queryset().defer(*Company.LIST_DEFERRED_FIELDS)
 
 
 class Company(models.Model):
@@ -8,21 +20,20 @@ class Company(models.Model):
     Core entity scraped from QKB (Qendra Kombëtare e Biznesit).
     Each record represents one registered business in Albania.
     """
-    LEGAL_FORMS = [
-        ('shpk', 'Sh.P.K. (LLC)'),
-        ('sha', 'Sh.A. (Joint Stock)'),
-        ('pf', 'Person Fizik (Sole Proprietor)'),
-        ('deg', 'Degë e Shoqërisë së Huaj (Foreign Branch)'),
-        ('other', 'Other'),
-    ]
-
-    STATUS_CHOICES = [
-        ('active', 'Aktiv'),
-        ('suspended', 'Pezulluar'),
-        ('dissolved', 'Çregjistruar'),
-        ('bankruptcy', 'Falimentuar'),
-        ('in_liquidation', 'Në Likuidim'),
-    ]
+    # Stored as smallints; never renumber existing members
+    class LegalForm(models.IntegerChoices):
+        SHPK = 1, 'Sh.P.K. (LLC)'
+        SHA = 2, 'Sh.A. (Joint Stock)'
+        PF = 3, 'Person Fizik (Sole Proprietor)'
+        DEG = 4, 'Degë e Shoqërisë së Huaj (Foreign Branch)'
+        OTHER = 5, 'Other'
+
+    class Status(models.IntegerChoices):
+        ACTIVE = 1, 'Aktiv'
+        SUSPENDED = 2, 'Pezulluar'
+        DISSOLVED = 3, 'Çregjistruar'
+        BANKRUPTCY = 4, 'Falimentuar'
+        IN_LIQUIDATION = 5, 'Në Likuidim'
 
     nipt = models.CharField(
         max_length=20,
@@ -30,11 +41,18 @@ class Company(models.Model):
         db_index=True,
         help_text="NIPT/NUIS - unique tax identification number"
     )
-    name = models.CharField(max_length=500, db_index=True)
+    name = models.CharField(max_length=500)
     name_latin = models.CharField(max_length=500, blank=True)
+    # Sort key for list ordering: name under the Albanian ICU collation (ç after c, ë after e),
+    # stored and indexed so ordered pages read the index instead of sorting
+    name_sort = models.GeneratedField(
+        expression=Collate('name', 'albanian'),
+        output_field=models.CharField(max_length=500, db_collation='albanian'),
+        db_persist=True,
+    )
 
-    legal_form = models.CharField(max_length=10, choices=LEGAL_FORMS, default='shpk')
-    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='active')
+    legal_form = models.PositiveSmallIntegerField(choices=LegalForm.choices, default=LegalForm.SHPK)
+    status = models.PositiveSmallIntegerField(choices=Status.choices, default=Status.ACTIVE)
     nace_code = models.CharField(max_length=10, blank=True, help_text="NACE activity code")
     nace_description = models.TextField(blank=True)
 
@@ -46,27 +64,69 @@ class Company(models.Model):
     city = models.CharField(max_length=100, blank=True, db_index=True)
     municipality = models.CharField(max_length=100, blank=True)
 
-    search_vector = SearchVectorField(null=True)
+    # Maintained by PostgreSQL on every INSERT/UPDATE. 'simple' keeps to_tsvector
+    # immutable (required for a stored generated column) and suits Albanian names.
+    # Weights rank name hits above people and registry-text hits; the PDF text is
+    # capped well under the 1 MB tsvector limit.
+    search_vector = models.GeneratedField(
+        expression=(
+            SearchVector('name', 'nipt', weight='A', config='simple')
+            + SearchVector('name_latin', 'names_blob', weight='B', config='simple')
+            + SearchVector('city', 'nace_description', weight='C', config='simple')
+            + SearchVector(Left('raw_pdf_text', 100000), weight='D', config='simple')
+        ),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
 
     raw_pdf_text = models.TextField(blank=True, help_text="Raw extracted text from QKB PDF")
+    # Shareholder and representative names, written by the scraper's upsert so person
+    # queries find the company through the search_vector index
+    names_blob = models.TextField(blank=True, editable=False)
+    raw_html_gz = models.BinaryField(null=True, blank=True, editable=False, help_text="Scraped detail page, gzipped")
+    # Digest of the last scraped shareholder list; lets re-scrapes skip the diff (see scraper)
+    shareholders_hash = models.CharField(max_length=16, blank=True, editable=False)
     source_url = models.URLField(blank=True)
     last_scraped = models.DateTimeField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # Large columns no page renders: defer them on reads (see views and admin).
+    # raw_pdf_text and names_blob stay in-row because the generated search_vector is computed from them.
+    WIDE_FIELDS = ('raw_pdf_text', 'raw_html_gz', 'names_blob', 'search_vector')
+    # List pages and cards also skip the free-text columns only the detail page shows
+    LIST_DEFERRED_FIELDS = WIDE_FIELDS + ('nace_description', 'address')
+
+    objects = models.Manager()
+    lite = CompanyListManager()
+
     class Meta:
         verbose_name_plural = "companies"
-        ordering = ['name']
+        ordering = ['name_sort']
         indexes = [
             GinIndex(fields=['search_vector']),
+            # Trigram indexes serve icontains (UPPER(col) LIKE '%...%'); ordering uses name_sort
+            GinIndex(OpClass(Upper('name'), name='gin_trgm_ops'), name='company_name_trgm'),
+            GinIndex(OpClass(Upper('name_latin'), name='gin_trgm_ops'), name='company_name_latin_trgm'),
             models.Index(fields=['status', 'city']),
             models.Index(fields=['legal_form']),
             models.Index(fields=['registration_date']),
+            models.Index(fields=['name_sort'], name='company_name_sort_idx'),
+        ]
+        constraints = [
+            # nipt lookups can stay exact (unique btree) and junk from the scrapers is rejected
+            # at insert; the scraper skips malformed NIPTs before they reach it
+            models.CheckConstraint(condition=models.Q(nipt__regex=NIPT_FORMAT), name='nipt_format'),
         ]
 
     def __str__(self):
         return f"{self.name} ({self.nipt})"
 
+    @property
+    def status_key(self):
+        """Lowercase status name (e.g. 'in_liquidation'), used for the CSS badge classes"""
+        return self.Status(self.status).name.lower()
+
 
 class Shareholder(models.Model):
     SHAREHOLDER_TYPES = [
@@ -77,7 +137,7 @@ class Shareholder(models.Model):
     company = models.ForeignKey(Company, on_delete=models.CASCADE, related_name='shareholders')
     shareholder_type = models.CharField(max_length=12, choices=SHAREHOLDER_TYPES)
 
-    full_name = models.CharField(max_length=300, blank=True, db_index=True)
+    full_name = models.CharField(max_length=300, blank=True)
 
     parent_company = models.ForeignKey(
         Company,
@@ -85,6 +145,7 @@ class Shareholder(models.Model):
         null=True,
         blank=True,
         related_name='subsidiaries',
+        db_index=False,  # see shareholder_parent_fk_idx
         help_text="If shareholder is another company in our DB"
     )
     parent_company_name = models.CharField(
@@ -104,8 +165,13 @@ class Shareholder(models.Model):
 
     class Meta:
         indexes = [
-            models.Index(fields=['full_name']),
-            models.Index(fields=['company', 'shareholder_type']),
+            GinIndex(OpClass(Upper('full_name'), name='gin_trgm_ops'), name='shareholder_full_name_trgm'),
+            GinIndex(OpClass(Upper('parent_company_name'), name='gin_trgm_ops'), name='shareholder_parent_name_trgm'),
+            # Most shareholders are individuals with no parent company; index only the linked rows
+            models.Index(
+                fields=['parent_company'], name='shareholder_parent_fk_idx',
+                condition=models.Q(parent_company__isnull=False),
+            ),
         ]
 
     def __str__(self):
@@ -116,14 +182,14 @@ class Shareholder(models.Model):
 
 class LegalRepresentative(models.Model):
     company = models.ForeignKey(Company, on_delete=models.CASCADE, related_name='representatives')
-    full_name = models.CharField(max_length=300, db_index=True)
+    full_name = models.CharField(max_length=300)
     role = models.CharField(max_length=100, default='Administrator')
     appointed_date = models.DateField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
         indexes = [
-            models.Index(fields=['full_name']),
+            GinIndex(OpClass(Upper('full_name'), name='gin_trgm_ops'), name='legalrep_full_name_trgm'),
         ]
 
     def __str__(self):
@@ -149,27 +215,68 @@ class OwnershipChange(models.Model):
         return f"{self.company.name} - {self.change_date}"
 
 
+class OwnershipSnapshot(models.Model):
+    """
+    One shareholder on one side of an OwnershipChange, as a plain row.
+    Lets history be filtered and joined by shareholder name or NIPT without
+    unpacking the JSON snapshots, which are kept for display.
+    """
+    SIDES = [
+        ('old', 'Before'),
+        ('new', 'After'),
+    ]
+
+    change = models.ForeignKey(OwnershipChange, on_delete=models.CASCADE, related_name='snapshots')
+    side = models.CharField(max_length=3, choices=SIDES)
+    name = models.CharField(max_length=300)
+    nipt = models.CharField(max_length=20, blank=True, help_text="Shareholder NIPT, when the shareholder is a company")
+    pct = models.DecimalField(max_digits=6, decimal_places=2, null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['nipt', 'side'], name='ownsnap_nipt_side_idx', condition=~models.Q(nipt='')),
+        ]
+
+    def __str__(self):
+        return f"{self.get_side_display()}: {self.name}"
+
+
+class Authority(models.Model):
+    """Contracting authority (ministry, municipality, SH.A) that awards tenders"""
+    name = models.CharField(max_length=500, unique=True, help_text="Contracting authority name")
+    authority_type = models.CharField(max_length=100, blank=True, help_text="e.g., SH.A, Ministry, Municipality")
+
+    class Meta:
+        verbose_name_plural = "authorities"
+        ordering = ['name']
+        indexes = [
+            GinIndex(OpClass(Upper('name'), name='gin_trgm_ops'), name='authority_name_trgm'),
+        ]
+
+    def __str__(self):
+        return self.name
+
+
 class Tender(models.Model):
     """
     Public procurement contract from APP (Agjencia e Prokurimit Publik) bulletins.
     Weekly bulletins list awarded contracts with company NIPTs and values.
     """
-    PROCEDURE_TYPES = [
-        ('open', 'Procedurë e Hapur'),
-        ('restricted', 'Procedurë e Kufizuar'),
-        ('negotiated', 'Procedurë me Negocim'),
-        ('proposal', 'Kërkesë për Propozim'),
-        ('consultancy', 'Shërbim Konsulence'),
-        ('small_value', 'Vlerë e Vogël'),
-        ('design_contest', 'Konkurs Projektimi'),
-        ('other', 'Other'),
-    ]
-
-    STATUS_CHOICES = [
-        ('awarded', 'Awarded'),
-        ('cancelled', 'Cancelled'),
-        ('appealed', 'Appealed'),
-    ]
+    # Stored as smallints; never renumber existing members
+    class ProcedureType(models.IntegerChoices):
+        OPEN = 1, 'Procedurë e Hapur'
+        RESTRICTED = 2, 'Procedurë e Kufizuar'
+        NEGOTIATED = 3, 'Procedurë me Negocim'
+        PROPOSAL = 4, 'Kërkesë për Propozim'
+        CONSULTANCY = 5, 'Shërbim Konsulence'
+        SMALL_VALUE = 6, 'Vlerë e Vogël'
+        DESIGN_CONTEST = 7, 'Konkurs Projektimi'
+        OTHER = 8, 'Other'
+
+    class Status(models.IntegerChoices):
+        AWARDED = 1, 'Awarded'
+        CANCELLED = 2, 'Cancelled'
+        APPEALED = 3, 'Appealed'
 
     # Bulletin reference
     bulletin_number = models.CharField(max_length=50, blank=True, help_text="APP bulletin number (e.g., 'Nr. 5')")
@@ -177,13 +284,12 @@ class Tender(models.Model):
     reference_number = models.CharField(max_length=100, blank=True, db_index=True, help_text="Procedure reference (REF-xxxxx-xx-xx-xx)")
 
     # Contracting authority
-    authority_name = models.CharField(max_length=500, help_text="Contracting authority name")
-    authority_type = models.CharField(max_length=100, blank=True, help_text="e.g., SH.A, Ministry, Municipality")
+    authority = models.ForeignKey(Authority, on_delete=models.PROTECT, related_name='tenders')
 
     # Procurement details
     title = models.TextField(help_text="Procurement object description")
-    procedure_type = models.CharField(max_length=20, choices=PROCEDURE_TYPES, default='open')
-    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='awarded')
+    procedure_type = models.PositiveSmallIntegerField(choices=ProcedureType.choices, default=ProcedureType.OPEN)
+    status = models.PositiveSmallIntegerField(choices=Status.choices, default=Status.AWARDED)
 
     # Financials (in ALL/lekë)
     estimated_value = models.DecimalField(max_digits=15, decimal_places=2, null=True, blank=True, help_text="Fondi limit (estimated value in lekë)")
@@ -196,6 +302,7 @@ class Tender(models.Model):
         null=True,
         blank=True,
         related_name='tenders_won',
+        db_index=False,  # leading column of tender_winner_order_idx
         help_text="Link to company in our DB (auto-linked by NIPT)"
     )
     winner_name = models.CharField(max_length=500, help_text="Winner company name as listed in bulletin")
@@ -212,29 +319,80 @@ class Tender(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # Not range-partitioned by bulletin_date: the table grows by one weekly bulletin, the
+    # column is nullable, and a partitioned table would need it in the primary key.
+    # tender_bulletin_order_idx already confines date-range scans.
     class Meta:
         ordering = ['-bulletin_date', '-contract_date']
         indexes = [
             models.Index(fields=['winner_nipt']),
-            models.Index(fields=['authority_name']),
-            models.Index(fields=['bulletin_date']),
+            GinIndex(OpClass(Upper('winner_name'), name='gin_trgm_ops'), name='tender_winner_name_trgm'),
+            # Both match Meta.ordering, so list pages read rows in order and stop at the LIMIT
+            # (admin change-list, and tenders_won on the company page)
+            models.Index(fields=['-bulletin_date', '-contract_date'], name='tender_bulletin_order_idx'),
+            models.Index(fields=['winner_company', '-bulletin_date', '-contract_date'], name='tender_winner_order_idx'),
             models.Index(fields=['reference_number']),
+            # link_tenders candidates: only tenders still waiting for their winner company
+            models.Index(
+                fields=['winner_nipt'], name='tender_unlinked_nipt_idx',
+                condition=models.Q(winner_company__isnull=True) & ~models.Q(winner_nipt=''),
+            ),
+            # Containment lookups by NIPT (disqualified_bidders__contains=[{'nipt': ...}]);
+            # jsonb_path_ops only supports @>, at a fraction of jsonb_ops' size
+            GinIndex(fields=['disqualified_bidders'], opclasses=['jsonb_path_ops'], name='tender_disq_gin'),
+            GinIndex(fields=['subcontractors'], opclasses=['jsonb_path_ops'], name='tender_subcontractors_gin'),
         ]
 
     def __str__(self):
         return f"{self.winner_name} — {self.title[:80]}"
 
     def save(self, *args, **kwargs):
-        # Auto-link winner_company by NIPT if not already set
-        if self.winner_nipt and not self.winner_company_id:
-            try:
-                self.winner_company = Company.objects.get(nipt=self.winner_nipt)
-            except Company.DoesNotExist:
-                # Trigger on-demand scrape so the company gets added to our DB
-                from .tasks import scrape_single_nipt_task
-                scrape_single_nipt_task.delay(self.winner_nipt.upper())
+        # NIPTs are stored uppercase (see Company); linking happens in bulk_link_winners()
+        self.winner_nipt = self.winner_nipt.strip().upper()
         super().save(*args, **kwargs)
 
+    @classmethod
+    def bulk_link_winners(cls, tenders):
+        """
+        Link saved tenders to their winner companies with one NIPT lookup and one
+        UPDATE, and queue on-demand scrapes for winners not yet in our DB.
+        Returns the number of tenders linked.
+        """
+        from celery import group
+        from .tasks import scrape_single_nipt_task
+
+        pending = [t for t in tenders if t.winner_nipt and not t.winner_company_id]
+        nipts = {t.winner_nipt for t in pending}
+        # One IN lookup on the unique nipt index per batch. A Redis/LRU nipt -> pk cache would
+        # still cost a round trip here, and would need invalidating when companies are deleted
+        existing = dict(Company.objects.filter(nipt__in=nipts).values_list('nipt', 'pk'))
+
+        linked = []
+        for tender in pending:
+            company_id = existing.get(tender.winner_nipt)
+            if company_id is not None:
+                tender.winner_company_id = company_id
+                linked.append(tender)
+        # One UPDATE writing the ids resolved above, with one WHEN per winning company
+        # rather than bulk_update's one per tender
+        if linked:
+            linked_ids = {t.winner_nipt: t.winner_company_id for t in linked}
+            cls.objects.filter(pk__in=[t.pk for t in linked]).update(
+                winner_company=models.Case(
+                    *(models.When(winner_nipt=nipt, then=models.Value(company_id))
+                      for nipt, company_id in linked_ids.items()),
+                    output_field=models.BigIntegerField(),
+                ),
+            )
+
+        # Trigger on-demand scrapes so the companies get added to our DB (one publish per batch,
+        # deduplicated by the set, and only once the caller's transaction has committed)
+        missing = nipts - existing.keys()
+        if missing:
+            scrapes = group(scrape_single_nipt_task.s(nipt) for nipt in sorted(missing))
+            transaction.on_commit(scrapes.apply_async)
+        return len(linked)
+
 
 class ScrapeLog(models.Model):
     STATUS_CHOICES = [
@@ -3,22 +3,35 @@ QKB Scraper — Two-phase pipeline:
   Phase 1: Collect NIPTs from opencorporates.al listing APIs
   Phase 2: Scrape detail pages for each NIPT
 """
+import asyncio
+import functools
+import gzip
+import hashlib
+import json
 import logging
+import re
 import time
 import html as html_module
+from datetime import date
 from decimal import Decimal, InvalidOperation
 
 import httpx
-from bs4 import BeautifulSoup
+import lxml.html
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.db import transaction
 from django.utils import timezone
 
-from .models import Company, Shareholder, LegalRepresentative, OwnershipChange, ScrapeLog
+from .models import NIPT_FORMAT, Company, Shareholder, LegalRepresentative, OwnershipChange, OwnershipSnapshot, ScrapeLog
 
 logger = logging.getLogger(__name__)
 
 BASE_URL = "https://opencorporates.al"
 REQUEST_DELAY = 1.5  # seconds between requests — be polite
 REQUEST_TIMEOUT = 30
+MAX_CONCURRENCY = 5  # detail pages in flight at once; each worker still waits REQUEST_DELAY
+SAVE_QUEUE_SIZE = 50  # parsed pages waiting to be saved before fetchers pause
+LISTING_CACHE_TIMEOUT = 7 * 24 * 3600  # validators + NIPTs per listing, for conditional GETs
 
 # Listing endpoints and their total record counts (as of Feb 2026)
 LISTING_ENDPOINTS = {
@@ -31,43 +44,101 @@ LISTING_ENDPOINTS = {
 }
 
 LEGAL_FORM_MAP = {
-    'shoqëri me përgjegjësi të kufizuar': 'shpk',
-    'shoqëri aksionare': 'sha',
-    'shoqëri aksionare sh.a': 'sha',
-    'person fizik': 'pf',
-    'degë e shoqërisë së huaj': 'deg',
+    'shoqëri me përgjegjësi të kufizuar': Company.LegalForm.SHPK,
+    'shoqëri aksionare': Company.LegalForm.SHA,
+    'shoqëri aksionare sh.a': Company.LegalForm.SHA,
+    'person fizik': Company.LegalForm.PF,
+    'degë e shoqërisë së huaj': Company.LegalForm.DEG,
 }
 
 
+# Substring fallbacks, longest (most specific) key first
+_LEGAL_FORM_SUBSTRINGS = sorted(LEGAL_FORM_MAP.items(), key=lambda item: -len(item[0]))
+
+
+# A run only sees a handful of distinct legal-form/status strings, so both maps are memoized
+@functools.lru_cache(maxsize=512)
 def _map_legal_form(value):
     cleaned = value.lower().strip()
     # Try exact match first
     if cleaned in LEGAL_FORM_MAP:
         return LEGAL_FORM_MAP[cleaned]
     # Try substring match
-    for key, code in LEGAL_FORM_MAP.items():
+    for key, code in _LEGAL_FORM_SUBSTRINGS:
         if key in cleaned:
             return code
-    return 'other'
+    return Company.LegalForm.OTHER
 
 STATUS_MAP = {
-    'aktiv': 'active',
-    'pezulluar': 'suspended',
-    'çregjistruar': 'dissolved',
-    'falimentuar': 'bankruptcy',
-    'në likuidim': 'in_liquidation',
+    'aktiv': Company.Status.ACTIVE,
+    'pezulluar': Company.Status.SUSPENDED,
+    'çregjistruar': Company.Status.DISSOLVED,
+    'falimentuar': Company.Status.BANKRUPTCY,
+    'në likuidim': Company.Status.IN_LIQUIDATION,
+}
+
+
+CLIENT_OPTIONS = {
+    'timeout': REQUEST_TIMEOUT,
+    'headers': {
+        'User-Agent': 'QKBIntelligence/1.0 (research; contact@qkb.al)',
+        'Accept': 'application/json, text/html',
+    },
+    'follow_redirects': True,
+    # One multiplexed connection to the host when it speaks h2; ALPN falls back to HTTP/1.1
+    'http2': True,
+}
+
+
+# Parsing patterns, compiled once (the helpers run for every company and shareholder)
+# Roman numeral prefixes (I., II., ... XII.) starting each owner entry; explicit list
+# to avoid partial matches within text
+_ROMAN_SPLIT_RE = re.compile(r'(?:^|[\s\n])(?:VIII|VII|VI|IV|IX|III|II|XI|XII|X|V|I)\.\s*\t?\s*')
+_QUOTED_RE = re.compile(r'["\u201c]([^"\u201d]+)["\u201d]')
+_NAME_PREFIX_RE = re.compile(r'^([^,]+)')
+_NIPT_RE = re.compile(r'NIPT\s+([A-Z]\d{7,9}[A-Z])')
+_HREF_NIPT_RE = re.compile(r'([A-Z]\d{7,9}[A-Z])')
+_NIPT_FORMAT_RE = re.compile(NIPT_FORMAT)
+_DIGITS_RE = re.compile(r'\d+')
+_CAPITAL_CLEAN_RE = re.compile(r'[^\d,]')
+_PCT_RE = re.compile(r'([\d.]+)\s*%')
+_NAME_COMMA_SPLIT_RE = re.compile(r',(?!\s*(?:Jr|Sr|III|II|PhD)\b)')
+
+# Legal-form and keyword markers that identify a company shareholder, matched as plain
+# substrings of the uppercased text in one regex pass. Owner strings are prose, so the
+# Albanian words for company count there too.
+_COMPANY_MARKERS = (
+    'SH.A', 'SHPK', 'SH.P.K', 'LLC', 'GMBH', 'SRL', 'LTD', 'INC', 'S.R.L', 'S.P.A',
+    'NYRT', 'B.V', 'A.G', 'HOLDING', 'BANK', 'GROUP', 'CORP',
+)
+_COMPANY_MARKER_RE = re.compile('|'.join(map(re.escape, _COMPANY_MARKERS)))
+_OWNER_COMPANY_MARKER_RE = re.compile('|'.join(map(re.escape, _COMPANY_MARKERS + ('SHOQËRI', 'KOMPANI'))))
+
+_MONTHS = {
+    'january': 1, 'february': 2, 'march': 3, 'april': 4,
+    'may': 5, 'june': 6, 'july': 7, 'august': 8,
+    'september': 9, 'october': 10, 'november': 11, 'december': 12,
+    'janar': 1, 'shkurt': 2, 'mars': 3, 'prill': 4,
+    'maj': 5, 'qershor': 6, 'korrik': 7, 'gusht': 8,
+    'shtator': 9, 'tetor': 10, 'nëntor': 11, 'dhjetor': 12,
 }
+_MONTH_NAMES = '|'.join(sorted(_MONTHS, key=len, reverse=True))
+
+# Every date format _parse_date accepts, one branch each; one finditer pass collects the candidates
+_DATE_RE = re.compile(rf'''
+    (?P<d>\d{{1,2}})[./](?P<m>\d{{1,2}})[./](?P<y>\d{{4}})              # DD.MM.YYYY, DD/MM/YYYY
+  | (?P<iy>\d{{4}})-(?P<im>\d{{2}})-(?P<id>\d{{2}})                    # YYYY-MM-DD
+  | (?P<mname>{_MONTH_NAMES})\s+(?P<md>\d{{1,2}}),?\s*(?P<my>\d{{4}})   # Month DD, YYYY
+  | (?P<dd>\d{{1,2}})\.?\s+(?P<dname>{_MONTH_NAMES})\s+(?P<dy>\d{{4}})  # DD Month YYYY
+''', re.VERBOSE | re.IGNORECASE)
 
 
 def get_client():
-    return httpx.Client(
-        timeout=REQUEST_TIMEOUT,
-        headers={
-            'User-Agent': 'QKBIntelligence/1.0 (research; contact@qkb.al)',
-            'Accept': 'application/json, text/html',
-        },
-        follow_redirects=True,
-    )
+    return httpx.Client(**CLIENT_OPTIONS)
+
+
+def get_async_client():
+    return httpx.AsyncClient(**CLIENT_OPTIONS, limits=httpx.Limits(max_connections=MAX_CONCURRENCY))
 
 
 # ──────────────────────────────────────────────
@@ -94,8 +165,22 @@ def collect_nipts_from_listings(categories=None):
             url = f"{BASE_URL}{endpoint}"
             logger.info(f"Fetching {category} listing from {url}")
 
+            # Revalidate the previous run's copy: an unchanged listing comes back as an empty 304
+            cache_key = f'scraper:listing:{category}'
+            cached = cache.get(cache_key)
+            headers = {}
+            if cached:
+                if cached['etag']:
+                    headers['If-None-Match'] = cached['etag']
+                if cached['last_modified']:
+                    headers['If-Modified-Since'] = cached['last_modified']
+
             try:
-                resp = client.get(url)
+                resp = client.get(url, headers=headers)
+                if resp.status_code == 304 and cached:
+                    logger.info(f"  {category}: not modified, {len(cached['nipts'])} NIPTs from cache")
+                    all_nipts.update(cached['nipts'])
+                    continue
                 resp.raise_for_status()
                 data = resp.json()
 
@@ -103,10 +188,21 @@ def collect_nipts_from_listings(categories=None):
                 total = data.get('recordsTotal', 0)
                 logger.info(f"  {category}: {len(records)} records fetched (total: {total})")
 
+                nipts = set()
                 for record in records:
                     nipt = _clean_nipt(record.get('NIPT', ''))
                     if nipt:
-                        all_nipts.add(nipt)
+                        nipts.add(nipt)
+                all_nipts |= nipts
+
+                etag = resp.headers.get('ETag')
+                last_modified = resp.headers.get('Last-Modified')
+                if etag or last_modified:
+                    cache.set(cache_key, {
+                        'etag': etag,
+                        'last_modified': last_modified,
+                        'nipts': sorted(nipts),
+                    }, LISTING_CACHE_TIMEOUT)
 
                 time.sleep(REQUEST_DELAY)
 
@@ -118,13 +214,23 @@ def collect_nipts_from_listings(categories=None):
 
 
 def _clean_nipt(raw):
-    """Extract plain NIPT from possibly HTML-wrapped value."""
-    if '<' in raw:
-        soup = BeautifulSoup(raw, 'html.parser')
-        text = soup.get_text(strip=True)
+    """
+    Extract plain, uppercase NIPT from possibly HTML-wrapped value.
+    Returns '' when the result does not have the stored NIPT shape (NIPT_FORMAT).
+    """
+    # Most listing records carry the bare NIPT: no markup, no entities
+    if '<' not in raw and '&' not in raw:
+        text = raw
+    elif '<' in raw:
+        # A tiny fragment; text_content() decodes entities
+        text = lxml.html.fragment_fromstring(raw, create_parent='div').text_content()
     else:
-        text = raw.strip()
-    return html_module.unescape(text)
+        text = html_module.unescape(raw)
+    nipt = text.strip().upper()
+    if nipt and not _NIPT_FORMAT_RE.fullmatch(nipt):
+        logger.warning(f"Skipping malformed NIPT: {nipt!r}")
+        return ''
+    return nipt
 
 
 # ──────────────────────────────────────────────
@@ -145,60 +251,92 @@ def scrape_company_detail(nipt, client=None):
     try:
         resp = client.get(url)
         resp.raise_for_status()
-        soup = BeautifulSoup(resp.text, 'lxml')
+        return _parse_detail_page(nipt, url, resp.text)
+    except Exception as e:
+        _log_scrape_error(nipt, e)
+        return None
+    finally:
+        if own_client:
+            client.close()
 
-        data = {
-            'nipt': nipt,
-            'source_url': url,
-            'raw_html': resp.text,
-        }
 
-        # Company name from <title> tag (h1 contains site name)
-        title = soup.find('title')
-        if title:
-            data['name'] = title.get_text(strip=True)
+async def scrape_company_detail_async(nipt, client):
+    """Async variant of scrape_company_detail() for the full-scrape pipeline."""
+    url = f"{BASE_URL}/en/nipt/{nipt}"
+
+    try:
+        resp = await client.get(url)
+        resp.raise_for_status()
+        return _parse_detail_page(nipt, url, resp.text)
+    except Exception as e:
+        _log_scrape_error(nipt, e)
+        return None
+
+
+def _parse_detail_page(nipt, url, text):
+    tree = lxml.html.document_fromstring(text)
+
+    data = {
+        'nipt': nipt,
+        'source_url': url,
+        'raw_html': text,
+    }
+
+    # Company name from <title> tag (h1 contains site name)
+    title = tree.find('.//title')
+    if title is not None:
+        data['name'] = _text(title)
 
-        # Parse the main info table
-        _parse_detail_table(soup, data)
+    # Parse the main info table
+    _parse_detail_table(tree, data)
 
-        return data
+    return data
 
-    except httpx.HTTPStatusError as e:
+
+def _log_scrape_error(nipt, e):
+    if isinstance(e, httpx.HTTPStatusError):
         if e.response.status_code == 404:
             logger.warning(f"Company not found: {nipt}")
         else:
             logger.error(f"HTTP error for {nipt}: {e}")
-        return None
-    except Exception as e:
+    else:
         logger.error(f"Failed to scrape {nipt}: {e}")
-        return None
-    finally:
-        if own_client:
-            client.close()
 
 
-def _parse_detail_table(soup, data):
+def _text(el):
+    """Element text with each text node stripped and joined (BeautifulSoup's get_text(strip=True))."""
+    return ''.join(part.strip() for part in el.itertext())
+
+
+def _has_class(name):
+    """XPath predicate matching one token of the class attribute."""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+def _parse_detail_table(tree, data):
     """
     Parse the main info table on opencorporates.al detail pages.
     Structure: <table> with <tr> rows, each having 2 <td> cells (label, value).
     """
-    tables = soup.find_all('table')
-    if not tables:
+    # Main info is in the first table
+    main_table = tree.find('.//table')
+    if main_table is None:
         return
 
-    # Main info is in the first table
-    main_table = tables[0]
     fields = {}
 
-    for row in main_table.find_all('tr'):
-        th = row.find('th')
-        td = row.find('td')
-        if th and td:
-            label = th.get_text(strip=True).lower().rstrip(':')
-            value = td.get_text(strip=True)
+    for row in main_table.iter('tr'):
+        th = row.find('.//th')
+        td = row.find('.//td')
+        if th is not None and td is not None:
+            label = _text(th).lower().rstrip(':')
+            value = _text(td)
             if label and value:
                 fields[label] = value
 
+    # Searchable registry text (search_vector weight D), without the page markup
+    data['registry_text'] = '\n'.join(f"{label}: {value}" for label, value in fields.items())
+
     # Map parsed fields to model fields
     if 'legal form' in fields or 'forma ligjore' in fields:
         data['legal_form'] = _map_legal_form(fields.get('legal form', fields.get('forma ligjore', '')))
@@ -242,7 +380,7 @@ def _parse_detail_table(soup, data):
 
     # If no shareholders from table, try the <ul> "Shareholders/Ownership" section
     if not data['shareholders']:
-        data['shareholders'] = _parse_shareholders_list(soup)
+        data['shareholders'] = _parse_shareholders_list(tree)
 
 
 # ──────────────────────────────────────────────
@@ -252,20 +390,33 @@ def _parse_detail_table(soup, data):
 def upsert_company(data):
     """
     Create or update a Company record from scraped data.
-    Returns (company, created, changed) tuple.
+    One transaction (one commit) per company instead of one per statement.
+    Returns (company, created, changed) tuple; company is None when the NIPT
+    is malformed and the page was skipped.
     """
+    # Checked before the transaction: the nipt_format constraint would otherwise fail the insert
+    if not _NIPT_FORMAT_RE.fullmatch(data['nipt']):
+        logger.warning(f"Skipping malformed NIPT: {data['nipt']!r}")
+        return None, False, False
+    return _upsert_company(data)
+
+
+@transaction.atomic
+def _upsert_company(data):
     nipt = data['nipt']
     now = timezone.now()
 
     defaults = {
         'name': data.get('name', ''),
-        'legal_form': data.get('legal_form', 'other'),
-        'status': data.get('status', 'active'),
+        'legal_form': data.get('legal_form', Company.LegalForm.OTHER),
+        'status': data.get('status', Company.Status.ACTIVE),
         'registration_date': data.get('registration_date'),
         'capital': data.get('capital'),
         'address': data.get('address', ''),
         'city': data.get('city', ''),
-        'raw_pdf_text': data.get('raw_html', '')[:50000],  # cap storage
+        'raw_pdf_text': data.get('registry_text', '')[:50000],  # cap storage
+        # Full page kept for re-parsing; HTML compresses several-fold
+        'raw_html_gz': gzip.compress(data['raw_html'].encode('utf-8')) if data.get('raw_html') else None,
         'source_url': data.get('source_url', ''),
         'last_scraped': now,
     }
@@ -278,21 +429,43 @@ def upsert_company(data):
         defaults=defaults,
     )
 
-    # Update search vector
-    from django.contrib.postgres.search import SearchVector
-    Company.objects.filter(pk=company.pk).update(
-        search_vector=SearchVector('name', 'name_latin', 'nipt', 'city')
-    )
-
-    # Detect ownership changes by diffing shareholders
-    changed = _sync_shareholders(company, data.get('shareholders', []))
+    # Detect ownership changes by diffing shareholders; an unchanged hash of the
+    # scraped list means the stored rows already match, so skip reading them
+    new_shareholders = data.get('shareholders', [])
+    new_hash = _shareholders_hash(new_shareholders) if new_shareholders else ''
+    changed = False
+    updates = {}
+    if new_hash and new_hash != company.shareholders_hash:
+        changed = _sync_shareholders(company, new_shareholders)
+        updates['shareholders_hash'] = new_hash
 
     # Sync administrators
-    _sync_administrators(company, data.get('administrators', []))
+    admins_changed = _sync_administrators(company, data.get('administrators', []))
+
+    # People's names feed search_vector; rebuild them only when either list was rewritten
+    if changed or admins_changed:
+        updates['names_blob'] = _names_blob(company)
+    if updates:
+        Company.objects.filter(pk=company.pk).update(**updates)
 
     return company, created, changed
 
 
+def _shareholders_hash(shareholders):
+    """Short digest of the (name, pct) pairs _sync_shareholders compares, order-independent."""
+    canonical = sorted((s['full_name'], str(s.get('ownership_pct') or '')) for s in shareholders)
+    return hashlib.blake2b(json.dumps(canonical).encode('utf-8'), digest_size=8).hexdigest()
+
+
+def _names_blob(company):
+    """Stored shareholder and representative names as one space-separated string."""
+    names = [
+        *company.shareholders.values_list('full_name', flat=True),
+        *company.representatives.values_list('full_name', flat=True),
+    ]
+    return ' '.join(names)
+
+
 def _parse_owner_string(owner_str):
     """
     Parse the 'Parent Company / Owner' field.
@@ -302,18 +475,13 @@ def _parse_owner_string(owner_str):
     2. Multiple owners with Roman numerals: 'I.\t"ARMAAR GROUP", shoqëri... II.\t"E D R O", shoqëri...'
     3. Simple name list: 'Edmond Leka dhe Niko Leka'
     """
-    import re
     shareholders = []
     if not owner_str:
         return shareholders
 
     # Split on Roman numeral prefixes (I., II., III., IV., V., VI., VII., VIII., IX., X., etc.)
     # These appear as "I.\t" or "I. " at the start of each shareholder entry
-    # Use explicit list to avoid partial matches within text
-    entries = re.split(
-        r'(?:^|[\s\n])(?:VIII|VII|VI|IV|IX|III|II|XI|XII|X|V|I)\.\s*\t?\s*',
-        owner_str
-    )
+    entries = _ROMAN_SPLIT_RE.split(owner_str)
 
     # If no Roman numerals found, treat the whole string as one entry
     if len(entries) <= 1:
@@ -325,14 +493,14 @@ def _parse_owner_string(owner_str):
             continue
 
         # Extract quoted company name if present: "Company Name"
-        quoted = re.match(r'["\u201c]([^"\u201d]+)["\u201d]', entry)
+        quoted = _QUOTED_RE.match(entry)
 
         if quoted:
             name = quoted.group(1).strip()
         else:
             # No quotes — take text up to first comma or descriptive phrase
             # e.g., "OTP Bank Nyrt, një shoqëri..." -> "OTP Bank Nyrt"
-            name_match = re.match(r'^([^,]+)', entry)
+            name_match = _NAME_PREFIX_RE.match(entry)
             name = name_match.group(1).strip() if name_match else entry[:100]
 
         # Skip noise
@@ -340,11 +508,8 @@ def _parse_owner_string(owner_str):
             continue
 
         # Detect company vs individual
-        company_markers = ['SH.A', 'SHPK', 'SH.P.K', 'LLC', 'GMBH', 'SRL', 'LTD', 'INC',
-                          'S.R.L', 'S.P.A', 'NYRT', 'B.V', 'A.G', 'HOLDING', 'BANK',
-                          'GROUP', 'CORP', 'shoqëri', 'kompani']
         full_text = (name + ' ' + entry[:200]).upper()
-        is_company = any(marker.upper() in full_text for marker in company_markers)
+        is_company = _OWNER_COMPANY_MARKER_RE.search(full_text) is not None
 
         sh = {
             'full_name': name[:300],
@@ -357,7 +522,7 @@ def _parse_owner_string(owner_str):
             sh['ownership_pct'] = pct
 
         # Try to extract NIPT of the parent company
-        nipt_match = re.search(r'NIPT\s+([A-Z]\d{7,9}[A-Z])', entry)
+        nipt_match = _NIPT_RE.search(entry)
         if nipt_match:
             sh['parent_nipt'] = nipt_match.group(1)
 
@@ -366,7 +531,7 @@ def _parse_owner_string(owner_str):
     return shareholders
 
 
-def _parse_shareholders_list(soup):
+def _parse_shareholders_list(tree):
     """
     Parse shareholders from the <ul class="list-group"> section
     under the "Shareholders/Ownership" heading.
@@ -374,35 +539,27 @@ def _parse_shareholders_list(soup):
     Each <li> contains an <a> with text like "Jolanda Trebicka - 100%"
     or "SOME COMPANY SH.A - 51%".
     """
-    import re
     shareholders = []
 
-    # Find the heading — span.string is None when tag has mixed content,
-    # so match on get_text() instead
-    sh_heading = soup.find(
-        'span', string=lambda t: t and 'Shareholders' in t
-    )
-    if not sh_heading:
-        # Fallback: search all spans by text content
-        for span in soup.find_all('span'):
-            if 'Shareholders' in span.get_text() or 'Ortakë' in span.get_text():
-                sh_heading = span
-                break
-    if not sh_heading:
+    # Find the heading in either locale with one query; "." is the span's full text,
+    # so headings with mixed content (icons, nested tags) match too
+    headings = tree.xpath("(//span[contains(., 'Shareholders') or contains(., 'Ortakë')])[1]")
+    if not headings:
         return shareholders
 
     # Walk up to the title-divider or parent div, then find the next <ul>
-    parent_div = sh_heading.find_parent('div', class_='title-divider')
-    if not parent_div:
-        parent_div = sh_heading.find_parent('div')
+    divs = headings[0].xpath('ancestor::div')
+    if not divs:
+        return shareholders
+    parent_div = next((div for div in reversed(divs) if 'title-divider' in div.classes), divs[-1])
 
-    ul = parent_div.find_next('ul', class_='list-group')
+    ul = parent_div.xpath(f"(descendant::ul | following::ul)[{_has_class('list-group')}][1]")
     if not ul:
         return shareholders
 
-    for li in ul.find_all('li', class_='list-group-item'):
-        a_tag = li.find('a')
-        text = a_tag.get_text(strip=True) if a_tag else li.get_text(strip=True)
+    for li in ul[0].xpath(f".//li[{_has_class('list-group-item')}]"):
+        a_tag = li.find('.//a')
+        text = _text(a_tag) if a_tag is not None else _text(li)
         if not text or len(text) < 2:
             continue
 
@@ -418,10 +575,7 @@ def _parse_shareholders_list(soup):
         if len(parts) > 1:
             pct = _parse_percentage(parts[1])
 
-        company_markers = ['SH.A', 'SHPK', 'SH.P.K', 'LLC', 'GMBH', 'SRL', 'LTD', 'INC',
-                          'S.R.L', 'S.P.A', 'NYRT', 'B.V', 'A.G', 'HOLDING', 'BANK',
-                          'GROUP', 'CORP']
-        is_company = any(marker in name.upper() for marker in company_markers)
+        is_company = _COMPANY_MARKER_RE.search(name.upper()) is not None
 
         sh = {
             'full_name': name[:300],
@@ -431,8 +585,8 @@ def _parse_shareholders_list(soup):
             sh['ownership_pct'] = pct
 
         # Try to extract NIPT from the href
-        if a_tag and a_tag.get('href'):
-            nipt_match = re.search(r'([A-Z]\d{7,9}[A-Z])', a_tag.get('href', ''))
+        if a_tag is not None and a_tag.get('href'):
+            nipt_match = _HREF_NIPT_RE.search(a_tag.get('href', ''))
             if nipt_match:
                 sh['parent_nipt'] = nipt_match.group(1)
 
@@ -451,7 +605,7 @@ def _sync_shareholders(company, new_shareholders):
         return False
 
     current = list(
-        company.shareholders.values_list('full_name', 'ownership_pct')
+        company.shareholders.values_list('full_name', 'ownership_pct', 'parent_company__nipt')
     )
     incoming = [
         (s['full_name'], s.get('ownership_pct'))
@@ -459,7 +613,7 @@ def _sync_shareholders(company, new_shareholders):
     ]
 
     # Normalize for comparison
-    current_set = {(n, str(p) if p else None) for n, p in current}
+    current_set = {(n, str(p) if p else None) for n, p, _ in current}
     incoming_set = {(n, str(p) if p else None) for n, p in incoming}
 
     if current_set == incoming_set:
@@ -467,53 +621,67 @@ def _sync_shareholders(company, new_shareholders):
 
     # Record the change
     if current:  # only log change if we had previous data
-        OwnershipChange.objects.create(
+        change = OwnershipChange.objects.create(
             company=company,
             change_date=timezone.now().date(),
             description="Ownership change detected during scrape",
             old_shareholders=[
                 {'name': n, 'pct': str(p) if p else None}
-                for n, p in current
+                for n, p, _ in current
             ],
             new_shareholders=[
                 {'name': s['full_name'], 'pct': str(s.get('ownership_pct', ''))}
                 for s in new_shareholders
             ],
         )
+        OwnershipSnapshot.objects.bulk_create([
+            *(OwnershipSnapshot(change=change, side='old', name=n, nipt=nipt or '', pct=p)
+              for n, p, nipt in current),
+            *(OwnershipSnapshot(change=change, side='new', name=s['full_name'],
+                                nipt=s.get('parent_nipt', ''), pct=s.get('ownership_pct'))
+              for s in new_shareholders),
+        ])
+
+    # Replace shareholders, linking parent_company FKs from one NIPT lookup
+    parent_nipts = {s['parent_nipt'] for s in new_shareholders if s.get('parent_nipt')}
+    parent_ids = dict(Company.objects.filter(nipt__in=parent_nipts).values_list('nipt', 'pk')) if parent_nipts else {}
 
-    # Replace shareholders
     company.shareholders.all().delete()
-    for s in new_shareholders:
-        # Try to link parent_company FK if we have their NIPT
-        parent_company = None
-        parent_nipt = s.get('parent_nipt')
-        if parent_nipt:
-            parent_company = Company.objects.filter(nipt=parent_nipt).first()
-
-        Shareholder.objects.create(
+    Shareholder.objects.bulk_create([
+        Shareholder(
             company=company,
             shareholder_type=s.get('shareholder_type', 'individual'),
             full_name=s.get('full_name', ''),
-            parent_company=parent_company,
+            parent_company_id=parent_ids.get(s.get('parent_nipt')),
             parent_company_name=s.get('full_name', '') if s.get('shareholder_type') == 'company' else '',
             ownership_pct=s.get('ownership_pct'),
         )
+        for s in new_shareholders
+    ])
 
     return True
 
 
 def _sync_administrators(company, new_admins):
-    """Replace administrators with latest scraped data."""
+    """
+    Replace administrators with latest scraped data.
+    Returns True if the stored rows were rewritten.
+    """
     if not new_admins:
-        return
+        return False
+
+    incoming = [(admin.get('full_name', ''), admin.get('role', 'Administrator')) for admin in new_admins]
+    # Most re-scrapes find the same people: one SELECT instead of a DELETE plus re-INSERT
+    if sorted(company.representatives.values_list('full_name', 'role')) == sorted(incoming):
+        return False
 
     company.representatives.all().delete()
-    for admin in new_admins:
-        LegalRepresentative.objects.create(
-            company=company,
-            full_name=admin.get('full_name', ''),
-            role=admin.get('role', 'Administrator'),
-        )
+    LegalRepresentative.objects.bulk_create([
+        LegalRepresentative(company=company, full_name=full_name, role=role)
+        for full_name, role in incoming
+    ])
+
+    return True
 
 
 # ──────────────────────────────────────────────
@@ -527,9 +695,6 @@ def run_full_scrape(categories=None, limit=None):
     limit: max companies to scrape (for testing)
     """
     log = ScrapeLog.objects.create(status='running')
-    scraped = 0
-    new_count = 0
-    updated_count = 0
     errors = []
 
     try:
@@ -542,33 +707,8 @@ def run_full_scrape(categories=None, limit=None):
 
         logger.info(f"Starting detail scrape for {len(nipt_list)} companies")
 
-        # Phase 2 + 3: Scrape and save each
-        with get_client() as client:
-            for i, nipt in enumerate(nipt_list):
-                try:
-                    data = scrape_company_detail(nipt, client=client)
-                    if data:
-                        company, created, changed = upsert_company(data)
-                        scraped += 1
-                        if created:
-                            new_count += 1
-                        else:
-                            updated_count += 1
-
-                        if (i + 1) % 50 == 0:
-                            logger.info(f"  Progress: {i + 1}/{len(nipt_list)} scraped")
-                            # Update log periodically
-                            log.companies_scraped = scraped
-                            log.companies_new = new_count
-                            log.companies_updated = updated_count
-                            log.save()
-
-                    time.sleep(REQUEST_DELAY)
-
-                except Exception as e:
-                    error_msg = f"Error scraping {nipt}: {e}"
-                    logger.error(error_msg)
-                    errors.append(error_msg)
+        # Phase 2 + 3: Scrape in parallel, save each as it arrives
+        scraped, new_count, updated_count = asyncio.run(_scrape_details(nipt_list, log, errors))
 
         log.companies_scraped = scraped
         log.companies_new = new_count
@@ -590,6 +730,64 @@ def run_full_scrape(categories=None, limit=None):
     return log
 
 
+async def _scrape_details(nipt_list, log, errors):
+    """
+    Producer/consumer: MAX_CONCURRENCY fetchers put parsed pages on a bounded queue, and
+    this coroutine drains it, upserting each page through sync_to_async (one shared thread,
+    never the event loop). Fetching continues while a save runs; the queue bound makes
+    fetchers wait when saves fall behind, so parsed pages can't pile up in memory.
+    Returns (scraped, new_count, updated_count).
+    """
+    queue = asyncio.Queue(maxsize=SAVE_QUEUE_SIZE)
+    pending = iter(nipt_list)  # shared by the fetchers, so each NIPT is fetched once
+    save_company = sync_to_async(upsert_company)
+    save_log = sync_to_async(log.save)
+    scraped = 0
+    new_count = 0
+    updated_count = 0
+
+    async def fetcher(client):
+        for nipt in pending:
+            # scrape_company_detail_async logs and returns None on failure, so every
+            # NIPT produces exactly one queue item
+            await queue.put((nipt, await scrape_company_detail_async(nipt, client)))
+            await asyncio.sleep(REQUEST_DELAY)
+
+    async with get_async_client() as client:
+        fetchers = [asyncio.create_task(fetcher(client)) for _ in range(MAX_CONCURRENCY)]
+
+        for i in range(len(nipt_list)):
+            nipt, data = await queue.get()
+            if data:
+                try:
+                    company, created, changed = await save_company(data)
+                except Exception as e:
+                    error_msg = f"Error saving {nipt}: {e}"
+                    logger.error(error_msg)
+                    errors.append(error_msg)
+                else:
+                    # None: upsert_company logged and skipped a malformed NIPT
+                    if company is not None:
+                        scraped += 1
+                        if created:
+                            new_count += 1
+                        else:
+                            updated_count += 1
+
+            if (i + 1) % 50 == 0:
+                logger.info(f"  Progress: {i + 1}/{len(nipt_list)} scraped")
+                # Update log periodically; counters are kept in memory, so this
+                # is one narrow UPDATE per 50 companies (errors are written at the end)
+                log.companies_scraped = scraped
+                log.companies_new = new_count
+                log.companies_updated = updated_count
+                await save_log(update_fields=['companies_scraped', 'companies_new', 'companies_updated'])
+
+        await asyncio.gather(*fetchers)
+
+    return scraped, new_count, updated_count
+
+
 def scrape_single_nipt(nipt):
     """
     On-demand scrape for a single NIPT.
@@ -609,73 +807,53 @@ def scrape_single_nipt(nipt):
 def _split_names(name_str):
     """
     Split a string of names separated by semicolons or commas.
-    Semicolons take priority. If no semicolons, fall back to commas.
+    Semicolons take priority. If no semicolons, fall back to commas,
+    except the comma before a suffix such as "Jr" or "PhD".
     Returns list of cleaned name strings.
     """
     if ';' in name_str:
         parts = name_str.split(';')
     else:
-        parts = name_str.split(',')
+        parts = _NAME_COMMA_SPLIT_RE.split(name_str)
+    return [name for name in map(str.strip, parts) if len(name) > 1]
+
 
-    names = []
-    for part in parts:
-        name = part.strip()
-        if name and len(name) > 1:
-            names.append(name)
-    return names
+_STATUS_SUBSTRINGS = sorted(STATUS_MAP.items(), key=lambda item: -len(item[0]))
 
 
+@functools.lru_cache(maxsize=512)
 def _map_status(value):
     cleaned = value.lower().strip()
     if cleaned in STATUS_MAP:
         return STATUS_MAP[cleaned]
-    for key, code in STATUS_MAP.items():
+    for key, code in _STATUS_SUBSTRINGS:
         if key in cleaned:
             return code
-    return 'active'
+    return Company.Status.ACTIVE
 
 
 def _parse_date(value):
     """Try to parse a date from various formats."""
-    import re
-    from datetime import date
-
-    # Try DD/MM/YYYY or DD.MM.YYYY
-    m = re.search(r'(\d{1,2})[./](\d{1,2})[./](\d{4})', value)
-    if m:
-        try:
-            return date(int(m.group(3)), int(m.group(2)), int(m.group(1)))
-        except ValueError:
-            pass
+    # Priority as when each format was searched in turn: the first DD.MM.YYYY anywhere in
+    # the value, then the first YYYY-MM-DD, then each month-name date. An impossible date
+    # (31.02.2020) falls through to the next candidate.
+    dmy = iso = None
+    named = []
+    for m in _DATE_RE.finditer(value):
+        if m['y']:
+            dmy = dmy or (m['y'], m['m'], m['d'])
+        elif m['iy']:
+            iso = iso or (m['iy'], m['im'], m['id'])
+        elif m['mname']:
+            named.append((m['my'], _MONTHS[m['mname'].lower()], m['md']))
+        else:
+            named.append((m['dy'], _MONTHS[m['dname'].lower()], m['dd']))
 
-    # Try YYYY-MM-DD
-    m = re.search(r'(\d{4})-(\d{2})-(\d{2})', value)
-    if m:
+    for year, month, day in filter(None, (dmy, iso, *named)):
         try:
-            return date(int(m.group(1)), int(m.group(2)), int(m.group(3)))
+            return date(int(year), int(month), int(day))
         except ValueError:
             pass
-
-    # Try "Month DD, YYYY" or "DD Month YYYY"
-    months = {
-        'january': 1, 'february': 2, 'march': 3, 'april': 4,
-        'may': 5, 'june': 6, 'july': 7, 'august': 8,
-        'september': 9, 'october': 10, 'november': 11, 'december': 12,
-        'janar': 1, 'shkurt': 2, 'mars': 3, 'prill': 4,
-        'maj': 5, 'qershor': 6, 'korrik': 7, 'gusht': 8,
-        'shtator': 9, 'tetor': 10, 'nëntor': 11, 'dhjetor': 12,
-    }
-    for month_name, month_num in months.items():
-        if month_name in value.lower():
-            nums = re.findall(r'\d+', value)
-            if len(nums) >= 2:
-                day = int(nums[0]) if int(nums[0]) <= 31 else int(nums[1])
-                year = int(nums[-1])
-                try:
-                    return date(year, month_num, day)
-                except ValueError:
-                    pass
-
     return None
 
 
@@ -684,9 +862,8 @@ def _parse_capital(value):
     Extract numeric capital value.
     Albanian format: "14 178 593 030,00" (spaces as thousands sep, comma as decimal).
     """
-    import re
     # Remove everything except digits and comma
-    cleaned = re.sub(r'[^\d,]', '', value)
+    cleaned = _CAPITAL_CLEAN_RE.sub('', value)
     # Replace comma with dot for decimal
     cleaned = cleaned.replace(',', '.')
     if cleaned:
@@ -699,8 +876,7 @@ def _parse_capital(value):
 
 def _parse_percentage(value):
     """Extract percentage from text like '51%' or '51.5 %'."""
-    import re
-    m = re.search(r'([\d.]+)\s*%', value)
+    m = _PCT_RE.search(value)
     if m:
         try:
             return Decimal(m.group(1))
@@ -1,3 +1,28 @@
-from django.test import TestCase
+from datetime import date
 
-# Create your tests here.
+from django.test import SimpleTestCase
+
+from .scraper import _parse_date
+
+
+class ParseDateTests(SimpleTestCase):
+
+    def test_formats(self):
+        self.assertEqual(_parse_date('15.03.2020'), date(2020, 3, 15))
+        self.assertEqual(_parse_date('5/3/2020'), date(2020, 3, 5))
+        self.assertEqual(_parse_date('2020-03-15'), date(2020, 3, 15))
+        self.assertEqual(_parse_date('March 15, 2020'), date(2020, 3, 15))
+        self.assertEqual(_parse_date('15 mars 2020'), date(2020, 3, 15))
+        self.assertEqual(_parse_date('15. Nëntor 2020'), date(2020, 11, 15))
+
+    def test_day_month_year_wins_over_earlier_iso(self):
+        self.assertEqual(_parse_date('2021-01-01 / 15.03.2020'), date(2020, 3, 15))
+
+    def test_impossible_date_falls_through(self):
+        self.assertEqual(_parse_date('31.02.2020 (2020-03-15)'), date(2020, 3, 15))
+        self.assertEqual(_parse_date('2020-02-31, 15 March 2020'), date(2020, 3, 15))
+
+    def test_no_date(self):
+        self.assertIsNone(_parse_date(''))
+        self.assertIsNone(_parse_date('n/a'))
+        self.assertIsNone(_parse_date('31.02.2020'))
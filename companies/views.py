@@ -5,36 +5,42 @@ from django.contrib.admin.views.decorators import staff_member_required
 from django.contrib.auth.decorators import login_required
 from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib.postgres.search import SearchQuery, SearchRank
-from django.db.models import Q
-from .models import Company, Shareholder, LegalRepresentative, Tender
+from django.db.models import CharField, DecimalField, F, Q, Value
+from .models import Company, Shareholder, LegalRepresentative
 
 
 # Albanian NIPT pattern: letter + digits + letter (e.g., L91234567A)
-NIPT_PATTERN = re.compile(r'^[A-Za-z]\d{7,9}[A-Za-z]$')
+NIPT_PATTERN = re.compile(r'[A-Za-z]\d{7,9}[A-Za-z]')
 
 FREE_DAILY_LIMIT = 10
 
+# Shorter queries skip the person search: pg_trgm extracts no trigram from them, so
+# full_name icontains would scan every shareholder and representative row
+PERSON_SEARCH_MIN_LENGTH = 3
+
+# Company columns shown on a person-match card in the search results
+PERSON_CARD_COMPANY_FIELDS = ('nipt', 'name', 'status', 'legal_form', 'city')
+
 
 def _check_and_increment_search(user):
     """
-    Check if user can search. Reset counter if date changed.
+    Check if user can search and count the search atomically. Counter resets daily.
     Returns (allowed, searches_remaining).
     Premium and superusers are unlimited.
     """
-    if user.is_premium or user.is_superuser:
+    if user.is_premium_effective:
         return True, None
 
+    if not user.bump_search(user.pk, limit=FREE_DAILY_LIMIT):
+        return False, 0
+
+    # Mirror the DB-side update on the in-memory user
     today = date.today()
     if user.searches_reset_date != today:
         user.searches_today = 0
         user.searches_reset_date = today
-
-    if user.searches_today >= FREE_DAILY_LIMIT:
-        return False, 0
-
     user.searches_today += 1
-    user.save(update_fields=['searches_today', 'searches_reset_date'])
-    return True, FREE_DAILY_LIMIT - user.searches_today
+    return True, max(0, FREE_DAILY_LIMIT - user.searches_today)
 
 
 @staff_member_required(login_url='accounts:login')
@@ -48,9 +54,10 @@ def search(request):
     results = []
     person_results = []
     on_demand_triggered = False
+    person_search_skipped = False
     limit_reached = False
     searches_remaining = None
-    is_premium = request.user.is_premium or request.user.is_superuser
+    is_premium = request.user.is_premium_effective
 
     if query:
         # Check rate limit
@@ -58,79 +65,84 @@ def search(request):
         if not allowed:
             limit_reached = True
         else:
+            # The query as a stored NIPT (uppercase, see the nipt_format constraint), or ''
+            # when it does not have the NIPT shape and so cannot match one
+            nipt = query.upper() if NIPT_PATTERN.fullmatch(query) else ''
             # Try NIPT exact match first
-            nipt_match = Company.objects.filter(nipt__iexact=query).first()
+            nipt_match = Company.lite.filter(nipt=nipt).first() if nipt else None
             if nipt_match:
                 results = [nipt_match]
             else:
                 # Full-text search on search_vector
-                search_query = SearchQuery(query, search_type='plain')
-                fts_results = Company.objects.filter(
+                search_query = SearchQuery(query, search_type='plain', config='simple')
+                # Evaluated once here: the emptiness check and the template share the rows
+                results = list(Company.lite.filter(
                     search_vector=search_query
                 ).annotate(
                     rank=SearchRank('search_vector', search_query)
-                ).order_by('-rank')[:50]
+                ).order_by('-rank')[:50])
 
-                if fts_results.exists():
-                    results = fts_results
-                else:
+                if not results:
                     # Fallback to icontains on company name
-                    results = Company.objects.filter(
+                    results = list(Company.lite.filter(
                         Q(name__icontains=query) |
                         Q(name_latin__icontains=query)
-                    ).distinct()[:50]
+                    )[:50])
 
                 # If query looks like a NIPT and no results, trigger on-demand scrape
-                if not results and NIPT_PATTERN.match(query):
+                if not results and nipt:
                     from .tasks import scrape_single_nipt_task
-                    scrape_single_nipt_task.delay(query.upper())
+                    scrape_single_nipt_task.delay(nipt)
                     on_demand_triggered = True
 
-            # Person search — always runs alongside company search
-            if not NIPT_PATTERN.match(query):
-                company_nipts = set()
-                if results:
-                    company_nipts = {c.nipt for c in results}
+            # Person search — runs alongside company search for non-NIPT queries
+            if not nipt and len(query) < PERSON_SEARCH_MIN_LENGTH:
+                person_search_skipped = True
+            elif not nipt:
+                company_nipts = {c.nipt for c in results}
 
                 seen = set()
+                # Shareholders and representatives in one UNION ALL round trip (50 rows per arm,
+                # shareholders first); the cards need only the person, the role and a few company columns
+                company_columns = [f'company__{name}' for name in PERSON_CARD_COMPANY_FIELDS]
                 shareholder_matches = Shareholder.objects.filter(
                     full_name__icontains=query
-                ).select_related('company')[:50]
-                for s in shareholder_matches:
-                    key = (s.company.nipt, s.full_name)
-                    if key not in seen:
-                        seen.add(key)
-                        pct = f"{s.ownership_pct:g}%" if s.ownership_pct else ''
-                        person_results.append({
-                            'company': s.company,
-                            'person_name': s.full_name,
-                            'role': 'Shareholder',
-                            'detail': pct,
-                            'in_company_results': s.company.nipt in company_nipts,
-                        })
-
+                ).values(
+                    'full_name', *company_columns,
+                    person_role=Value('Shareholder', output_field=CharField()),
+                    pct=F('ownership_pct'),
+                    arm=Value(0),
+                )[:50]
                 rep_matches = LegalRepresentative.objects.filter(
                     full_name__icontains=query
-                ).select_related('company')[:50]
-                for r in rep_matches:
-                    key = (r.company.nipt, r.full_name)
+                ).values(
+                    'full_name', *company_columns,
+                    person_role=F('role'),
+                    pct=Value(None, output_field=DecimalField()),
+                    arm=Value(1),
+                )[:50]
+                for row in shareholder_matches.union(rep_matches, all=True).order_by('arm'):
+                    company = Company(**{name: row[f'company__{name}'] for name in PERSON_CARD_COMPANY_FIELDS})
+                    key = (company.nipt, row['full_name'])
                     if key not in seen:
                         seen.add(key)
                         person_results.append({
-                            'company': r.company,
-                            'person_name': r.full_name,
-                            'role': r.role,
-                            'detail': '',
-                            'in_company_results': r.company.nipt in company_nipts,
+                            'company': company,
+                            'person_name': row['full_name'],
+                            'role': row['person_role'],
+                            'detail': f"{row['pct']:g}%" if row['pct'] else '',
+                            'in_company_results': company.nipt in company_nipts,
                         })
 
     return render(request, 'companies/search.html', {
         'query': query,
         'results': results,
-        'result_count': len(results) if isinstance(results, list) else results.count(),
+        'result_count': len(results),
         'person_results': person_results,
         'person_count': len(person_results),
         'on_demand_triggered': on_demand_triggered,
+        'person_search_skipped': person_search_skipped,
+        'person_search_min_length': PERSON_SEARCH_MIN_LENGTH,
         'limit_reached': limit_reached,
         'searches_remaining': searches_remaining,
         'is_premium': is_premium,
@@ -139,11 +151,12 @@ def search(request):
 
 @staff_member_required(login_url='accounts:login')
 def company_detail(request, nipt):
-    company = get_object_or_404(Company, nipt=nipt)
+    company = get_object_or_404(Company.objects.defer(*Company.WIDE_FIELDS), nipt=nipt)
     shareholders = company.shareholders.all()
     representatives = company.representatives.all()
-    ownership_changes = company.ownership_changes.all()[:20]
-    tenders = company.tenders_won.all()[:50]
+    # The timeline shows only date and description; the JSON snapshots stay in the table
+    ownership_changes = company.ownership_changes.defer('old_shareholders', 'new_shareholders')[:20]
+    tenders = company.tenders_won.select_related('authority').defer('disqualified_bidders', 'subcontractors')[:50]
 
     return render(request, 'companies/company_detail.html', {
         'company': company,
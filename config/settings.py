@@ -29,6 +29,9 @@ SITE_ID = 1
 
 AUTHENTICATION_BACKENDS = [
     'social_core.backends.google.GoogleOAuth2',
+    'accounts.backends.EmailOrUsernameBackend',
+    # Sessions created before EmailOrUsernameBackend store this backend's path; keep it
+    # so those users stay logged in
     'django.contrib.auth.backends.ModelBackend',
 ]
 
@@ -48,7 +51,6 @@ TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [BASE_DIR / 'templates'],
-        'APP_DIRS': True,
         'OPTIONS': {
             'context_processors': [
                 'django.template.context_processors.request',
@@ -57,6 +59,13 @@ TEMPLATES = [
                 'social_django.context_processors.backends',
                 'social_django.context_processors.login_redirect',
             ],
+            # Parsed templates stay in memory; the dev autoreloader resets this cache on edits
+            'loaders': [
+                ('django.template.loaders.cached.Loader', [
+                    'django.template.loaders.filesystem.Loader',
+                    'django.template.loaders.app_directories.Loader',
+                ]),
+            ],
         },
     },
 ]
@@ -71,6 +80,18 @@ DATABASES = {
         'PASSWORD': env('DB_PASSWORD', default='postgres'),
         'HOST': env('DB_HOST', default='127.0.0.1'),
         'PORT': env('DB_PORT', default='5432'),
+        'OPTIONS': {
+            # psycopg 3 connection pool, one per process (requires CONN_MAX_AGE = 0, the default)
+            'pool': {
+                'min_size': env.int('DB_POOL_MIN_SIZE', default=2),
+                'max_size': env.int('DB_POOL_MAX_SIZE', default=10),
+            },
+            # Server-side binding lets psycopg prepare the repeated keyed lookups
+            # (nipt = %s, winner_nipt IN ...) after prepare_threshold executions.
+            # Leave off behind PgBouncer in transaction mode.
+            'server_side_binding': env.bool('DB_SERVER_SIDE_BINDING', default=False),
+            'prepare_threshold': 5,
+        },
     }
 }
 
@@ -108,6 +129,21 @@ EMAIL_HOST_PASSWORD = env('EMAIL_HOST_PASSWORD', default='')
 EMAIL_USE_TLS = env.bool('EMAIL_USE_TLS', default=True)
 DEFAULT_FROM_EMAIL = env('DEFAULT_FROM_EMAIL', default='noreply@qkb.al')
 
+# Cache — local memory in dev, set CACHE_URL=redis://localhost:6379/2 in production
+CACHES = {
+    'default': env.cache('CACHE_URL', default='locmemcache://'),
+}
+
+# With a shared cache (CACHE_URL), sessions are read from it and written through to the DB,
+# so authenticated requests skip the django_session SELECT. A per-process locmem cache would
+# let each worker keep serving its own copy after a logout or key rotation elsewhere, so
+# without one sessions stay on the plain db backend.
+if CACHES['default']['BACKEND'] not in (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+):
+    SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+
 # Social Auth (Google)
 SOCIAL_AUTH_GOOGLE_OAUTH2_KEY = env('GOOGLE_OAUTH2_KEY', default='')
 SOCIAL_AUTH_GOOGLE_OAUTH2_SECRET = env('GOOGLE_OAUTH2_SECRET', default='')
@@ -149,6 +185,10 @@ CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TASK_TRACK_STARTED = True
 CELERY_BROKER_CONNECTION_RETRY_ON_STARTUP = True
+# Outbound email gets its own queue so it never waits behind a long scrape
+CELERY_TASK_ROUTES = {
+    'accounts.tasks.send_*': {'queue': 'email_queue'},
+}
 
 # Celery Beat schedule
 from celery.schedules import crontab
@@ -157,4 +197,12 @@ CELERY_BEAT_SCHEDULE = {
         'task': 'companies.tasks.run_full_scrape_task',
         'schedule': crontab(hour=3, minute=0),
     },
+    'flush-click-queue': {
+        'task': 'accounts.tasks.flush_clicks_task',
+        'schedule': 5.0,  # ClickTracking.FLUSH_INTERVAL
+    },
+    'nightly-click-rollup': {
+        'task': 'accounts.tasks.rollup_clicks_task',
+        'schedule': crontab(hour=0, minute=15),
+    },
 }